@@ -0,0 +1,100 @@
+"""Per-edit overhead of workspace checkpoints on large files.
+
+    python benchmarks/bench_checkpoints.py [--sizes 1,10,100] [--edits 5] [--dir /mnt/btrfs/tmp]
+
+For each file size (MB) the `replace_exact_in_file` tool is timed alone and
+with a checkpoint taken first, as ToolExecutor does. Also reported: a
+checkpoint of an unchanged file (answered from the stat cache) and rolling
+back all edits. Reflinks are only used when --dir is on a filesystem that
+supports them (btrfs, XFS); elsewhere objects are plain copies.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from contextlib import redirect_stdout
+
+from openagentcli.checkpoints import CheckpointStore
+from openagentcli.server.mcp_server import replace_exact_in_file
+
+LINE = "value = compute(alpha, beta, gamma)  # padding padding padding padding\n"
+
+
+def make_file(path: Path, size_mb: int):
+    line_count = size_mb * 1024 * 1024 // len(LINE)
+    with open(path, "w") as f:
+        f.write("MARKER 0\n")
+        for _ in range(0, line_count, 10000):
+            f.write(LINE * 10000)
+
+
+def edit(path: Path, i: int):
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        replace_exact_in_file(str(path), f"MARKER {i}\n", f"MARKER {i + 1}\n")
+
+
+def run_size(workdir: Path, size_mb: int, edits: int) -> dict:
+    path = workdir / f"large_{size_mb}mb.txt"
+    make_file(path, size_mb)
+    store = CheckpointStore(root=workdir / f"store_{size_mb}")
+
+    plain = []
+    for i in range(edits):
+        start = time.perf_counter()
+        edit(path, i)
+        plain.append(time.perf_counter() - start)
+
+    snapshot, checkpointed = [], []
+    for i in range(edits, 2 * edits):
+        start = time.perf_counter()
+        store.snapshot("replace_exact_in_file", [str(path)])
+        snapshot.append(time.perf_counter() - start)
+        edit(path, i)
+        checkpointed.append(time.perf_counter() - start)
+
+    store.snapshot("after edits", [str(path)])
+    start = time.perf_counter()
+    store.snapshot("unchanged", [str(path)])
+    unchanged = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.rollback(1)
+    rollback = time.perf_counter() - start
+    assert path.read_text().startswith(f"MARKER {edits}\n")
+
+    path.unlink()
+    return {
+        "edit": statistics.median(plain),
+        "snapshot": statistics.median(snapshot),
+        "edit_with_snapshot": statistics.median(checkpointed),
+        "unchanged": unchanged,
+        "rollback": rollback,
+        "reflink": any(store.reflink_ok.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,10,100", help="comma-separated file sizes in MB")
+    parser.add_argument("--edits", type=int, default=5, help="timed edits per size and mode")
+    parser.add_argument("--dir", help="directory to work in (its filesystem decides whether reflinks work)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(dir=args.dir))
+    try:
+        print(f"{'size':>7} {'edit':>10} {'snapshot':>10} {'overhead':>9} {'unchanged':>10} {'rollback':>10}  objects")
+        for size in (int(s) for s in args.sizes.split(",") if s):
+            r = run_size(workdir, size, args.edits)
+            print(f"{size:>5}MB {r['edit'] * 1000:8.1f}ms {r['snapshot'] * 1000:8.1f}ms "
+                  f"{r['snapshot'] / r['edit']:8.0%} {r['unchanged'] * 1000:8.2f}ms {r['rollback'] * 1000:8.1f}ms  "
+                  f"{'reflink' if r['reflink'] else 'copy'}", file=sys.stdout, flush=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Memory use of a long synthetic session: bytes per message and peak RSS.
+
+    python benchmarks/bench_message_memory.py [--messages 10000]
+
+Each variant runs in its own subprocess so peak RSS is not shared. The
+"plain" variant uses the previous unslotted dataclass with full str content.
+"""
+import sys
+import json
+import random
+import argparse
+import resource
+import subprocess
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from synthetic import python_module
+from openagentcli.protocol import Message, ToolCall, Role
+
+
+@dataclass
+class PlainMessage:
+    role: Role
+    content: Optional[str] = None
+    tool_calls: Optional[list] = None
+    tool_call_id: Optional[str] = None
+    tool_plan: Optional[str] = None
+
+
+def build_session(cls, count: int, seed: int = 0) -> list:
+    """User turns, tool calls and tool results of mixed size, as seen in editing sessions."""
+    rng = random.Random(seed)
+    messages = []
+    while len(messages) < count:
+        messages.append(cls(role=Role.USER, content=f"please look at module {rng.randrange(1000)} and fix the bug"))
+        for _ in range(rng.randrange(1, 4)):
+            call_id = f"call_{len(messages)}"
+            messages.append(cls(role=Role.ASSISTANT, tool_plan="I will read the file.",
+                                tool_calls=[ToolCall(id=call_id, name="read_file", arguments={"path": f"src/m{rng.randrange(1000)}.py"})]))
+            body = python_module(rng, classes=rng.randrange(1, 30), methods=rng.randrange(2, 10))
+            messages.append(cls(role=Role.TOOL, tool_call_id=call_id, content=json.dumps(body)))
+        messages.append(cls(role=Role.ASSISTANT, content="Done. " * rng.randrange(5, 50)))
+    return messages[:count]
+
+
+def run_variant(variant: str, count: int):
+    cls = Message if variant == "compact" else PlainMessage
+    tracemalloc.start()
+    messages = build_session(cls, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"variant": variant, "messages": len(messages), "bytes_per_message": current / len(messages),
+                      "peak_rss_mb": peak_rss_kb / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--variant", choices=["plain", "compact"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.messages)
+        return
+
+    for variant in ("plain", "compact"):
+        out = subprocess.run([sys.executable, __file__, "--variant", variant, "--messages", str(args.messages)],
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out)
+        print(f"{variant:>8}: {result['bytes_per_message']:,.0f} bytes/message  peak RSS {result['peak_rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Index size, build time and query latency of the BM25 index behind rank_search.
+
+    python benchmarks/bench_rank_search.py [--files 100000] [--root PATH]
+
+Without --root a synthetic Python repo is generated in a temporary directory.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+from synthetic import WORDS, make_python_repo
+from openagentcli.server.search_index import SearchIndex
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def measure(index: SearchIndex, queries: list[str]) -> str:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, 10)
+        latencies.append(time.perf_counter() - start)
+    return f"p50 {statistics.median(latencies) * 1000:.1f} ms  p95 {percentile(latencies, 0.95) * 1000:.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", help="existing repository to index instead of a synthetic one")
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--touch", type=int, default=20, help="files modified before the incremental refresh")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the persisted index out of the real home directory
+        os.environ["HOME"] = tmp
+        root = Path(args.root) if args.root else make_python_repo(Path(tmp) / "repo", args.files)
+
+        start = time.perf_counter()
+        index = SearchIndex(str(root))
+        index.refresh()
+        cold = time.perf_counter() - start
+        print(f"files: {len(index.by_path)}  terms: {len(index.terms)}  postings: {index.indices.size}  "
+              f"index size: {index.path.stat().st_size / 1e6:.1f} MB")
+        print(f"cold build:          {cold:.2f}s")
+
+        start = time.perf_counter()
+        SearchIndex(str(root)).refresh()
+        print(f"reload + no-op scan: {time.perf_counter() - start:.2f}s")
+
+        rng = random.Random(0)
+        queries = [" ".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(args.queries)]
+        # Query cost without the directory scan that search() does first
+        index.refresh = lambda force=True: None
+        print(f"query (no scan):     {measure(index, queries)}")
+        del index.refresh
+
+        for rel in rng.sample(sorted(index.by_path), min(args.touch, len(index.by_path))):
+            path = root / rel
+            path.write_text(path.read_text() + "\ndef touched_handler():\n    pass\n")
+        start = time.perf_counter()
+        index.refresh()
+        print(f"refresh after {args.touch} edits: {time.perf_counter() - start:.2f}s  ({len(index.pending)} pending, "
+              f"base {index.path.stat().st_size / 1e6:.1f} MB, delta {index.delta_path.stat().st_size / 1e3:.1f} KB)")
+
+        # What an edit tool pays through notify_changed: one file, no tree walk
+        path = root / rel
+        path.write_text(path.read_text() + "\ndef another_handler():\n    pass\n")
+        start = time.perf_counter()
+        index.update_path(rel)
+        print(f"update one file:     {(time.perf_counter() - start) * 1000:.1f} ms")
+        gap = index.next_scan - time.monotonic()
+        print(f"rank_search:         {measure(index, queries[:20])}  (next tree walk in {gap:.1f}s)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Throughput of the shell tool on very large outputs.
+
+Compares the renderer-backed `shell` tool against the previous per-line
+`print(..., flush=True)` implementation on `yes | head -n N`.
+
+    python benchmarks/bench_shell_output.py [--lines 1000000] [--tty]
+
+By default the streamed output goes to /dev/null so only the tool's own cost
+is measured; pass --tty to write to the real terminal.
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+from contextlib import redirect_stdout, redirect_stderr
+
+from openagentcli.server.mcp_server import shell
+
+
+def legacy_shell(command: str) -> dict:
+    process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, encoding='utf-8', errors='replace', bufsize=1)
+    stdout_lines = []
+    stderr_lines = []
+    for line in process.stdout:
+        print(line, end='', flush=True)
+        stdout_lines.append(line)
+    for line in process.stderr:
+        print(line, end='', file=sys.stderr, flush=True)
+        stderr_lines.append(line)
+    process.wait()
+    return {"stdout": ''.join(stdout_lines), "stderr": ''.join(stderr_lines), "returncode": process.returncode}
+
+
+def timed(fn, command: str, tty: bool) -> float:
+    start = time.perf_counter()
+    if tty:
+        fn(command)
+    else:
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull), redirect_stderr(devnull):
+            fn(command)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tty", action="store_true", help="write output to the terminal instead of /dev/null")
+    args = parser.parse_args()
+
+    command = f"yes | head -n {args.lines}"
+    for name, fn in (("per-line flush", legacy_shell), ("renderer", shell)):
+        best = min(timed(fn, command, args.tty) for _ in range(args.repeat))
+        print(f"{name:>15}: {best:.3f}s  ({args.lines / best:,.0f} lines/s)", file=sys.__stderr__)
+
+
+if __name__ == "__main__":
+    main()
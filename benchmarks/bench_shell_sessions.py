@@ -0,0 +1,55 @@
+"""Latency of small shell commands: warm pty sessions vs. spawning /bin/sh per call.
+
+    python benchmarks/bench_shell_sessions.py [--commands 1000] [--command "echo hi"]
+"""
+import sys
+import time
+import argparse
+import statistics
+
+from openagentcli.server.mcp_server import run_spawned
+from openagentcli.server.shell_sessions import ShellPool
+
+
+class NullBlock:
+    def write(self, line, stream=None):
+        pass
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def measure(fn, command: str, count: int) -> list[float]:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        result = fn(command)
+        latencies.append(time.perf_counter() - start)
+        assert result["returncode"] == 0, result
+    return latencies
+
+
+def report(name: str, latencies: list[float]):
+    total = sum(latencies)
+    print(f"{name:>14}: total {total:.2f}s  p50 {statistics.median(latencies) * 1000:.2f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:.2f} ms  p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=1000)
+    parser.add_argument("--command", default="echo hi")
+    args = parser.parse_args()
+
+    report("spawn per call", measure(lambda c: run_spawned(c, NullBlock()), args.command, args.commands))
+
+    pool = ShellPool()
+    pool.run("true")  # start the session outside the measurement
+    report("warm session", measure(pool.run, args.command, args.commands))
+    pool.close_all()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Build time and query latency of the symbol index behind code_outline/find_symbol.
+
+    python benchmarks/bench_symbol_index.py [--files 5000] [--root PATH]
+
+Without --root a synthetic Python repo is generated in a temporary directory.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+from synthetic import make_python_repo
+from openagentcli.server.symbol_index import SymbolIndex
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", help="existing repository to index instead of a synthetic one")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--touch", type=int, default=20, help="files modified before the incremental refresh")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the persisted index out of the real home directory
+        os.environ["HOME"] = tmp
+        root = Path(args.root) if args.root else make_python_repo(Path(tmp) / "repo", args.files)
+
+        start = time.perf_counter()
+        index = SymbolIndex(str(root))
+        index.refresh()
+        cold = time.perf_counter() - start
+        symbols = [s for entry in index.files.values() for s in entry["symbols"]]
+        print(f"files: {len(index.files)}  symbols: {len(symbols)}  index size: {index.path.stat().st_size / 1e6:.1f} MB")
+        print(f"cold build:          {cold:.2f}s")
+
+        start = time.perf_counter()
+        SymbolIndex(str(root)).refresh()
+        print(f"reload + no-op scan: {time.perf_counter() - start:.2f}s")
+
+        rng = random.Random(0)
+        for rel in rng.sample(sorted(index.files), min(args.touch, len(index.files))):
+            path = root / rel
+            path.write_text(path.read_text() + "\ndef touched():\n    pass\n")
+        start = time.perf_counter()
+        index.refresh()
+        print(f"refresh after {args.touch} edits: {time.perf_counter() - start:.2f}s")
+
+        names = [rng.choice(symbols)["name"].split(".")[-1] for _ in range(args.queries)]
+        latencies = []
+        for name in names:
+            start = time.perf_counter()
+            index.find(name)
+            latencies.append(time.perf_counter() - start)
+        print(f"find_symbol: p50 {statistics.median(latencies) * 1000:.1f} ms  p95 {percentile(latencies, 0.95) * 1000:.1f} ms")
+
+        files = rng.sample(sorted(index.files), min(args.queries, len(index.files)))
+        latencies = []
+        for rel in files:
+            start = time.perf_counter()
+            index.outline(str(root / rel))
+            latencies.append(time.perf_counter() - start)
+        print(f"code_outline: p50 {statistics.median(latencies) * 1000:.2f} ms  p95 {percentile(latencies, 0.95) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
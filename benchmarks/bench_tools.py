@@ -0,0 +1,244 @@
+"""Latency and throughput of the built-in MCP tools on synthetic trees.
+
+    python benchmarks/bench_tools.py [--shapes deep,wide,small,huge,binary] [--scale 1.0]
+                                     [--output results.json] [--compare baseline.json]
+
+Every tool is timed cold (in-process caches and persisted indexes cleared
+before each call; the OS page cache is left alone unless --drop-caches is
+given and we are root) and warm (after one untimed call). Read-only tools are
+then called concurrently through `mcp.call_tool` at each --concurrency level.
+Results are written as JSON with percentiles; --compare prints the change in
+p50 against a saved run and exits with status 1 on regressions.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+from pathlib import Path
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+
+from synthetic import TREE_SHAPES, make_tree, python_module
+from openagentcli.server import mcp_server, symbol_index, search_index
+from openagentcli.server.read_cache import read_cache
+
+
+def percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {"n": len(ordered), "mean": statistics.fmean(ordered), "min": ordered[0],
+            "p50": at(0.5), "p90": at(0.9), "p99": at(0.99), "max": ordered[-1]}
+
+
+class Scratch:
+    """Unique paths for the edit tools, so repeated calls never collide."""
+
+    def __init__(self, manifest: dict):
+        self.count = 0
+        self.source = manifest["text_files"][0]
+        self.content = python_module(random.Random(1))
+        Path("scratch").mkdir(exist_ok=True)
+
+    def new_path(self) -> str:
+        self.count += 1
+        return f"scratch/new_{self.count}.py"
+
+    def existing(self) -> str:
+        path = "scratch/edit.py"
+        if not os.path.exists(path):
+            shutil.copyfile(self.source, path)
+        return path
+
+
+def tool_cases(manifest: dict, scratch: Scratch) -> dict:
+    """Benchmark case -> (tool name, function returning the arguments for one call)."""
+    rng = random.Random(0)
+    files = manifest["text_files"]
+    largest = max(files, key=os.path.getsize)
+    return {
+        "read_file": ("read_file", lambda: {"path": rng.choice(files)}),
+        "read_file_largest": ("read_file", lambda: {"path": largest}),
+        "read_file_range": ("read_file", lambda: {"path": largest, "start_line": 100, "end_line": 140}),
+        "list_directory": ("list_directory", lambda: {"path": "."}),
+        "list_directory_recursive": ("list_directory", lambda: {"path": ".", "depth": 3}),
+        "search_files_by_name": ("search_files_by_name", lambda: {"pattern": r"handler|_1\d\.py$"}),
+        "search_files_by_content": ("search_files_by_content", lambda: {"pattern": r"def \w+_handler_\w+"}),
+        "rank_search": ("rank_search", lambda: {"query": "request handler cache", "top_k": 10}),
+        "code_outline": ("code_outline", lambda: {"path": rng.choice(files)}),
+        "find_symbol": ("find_symbol", lambda: {"name": "token_handler"}),
+        "create_file": ("create_file", lambda: {"path": scratch.new_path(), "content": scratch.content}),
+        "overwrite_file": ("overwrite_file", lambda: {"path": scratch.existing(), "content": scratch.content}),
+        "replace_exact_in_file": ("replace_exact_in_file", lambda: {"path": scratch.existing(), "old_str": "import json", "new_str": "import json"}),
+        "shell": ("shell", lambda: {"command": "true"}),
+        "shell_output": ("shell", lambda: {"command": f"cat {os.path.abspath(largest)} | head -c 1000000"}),
+    }
+
+# Cases that are also load-tested concurrently
+READ_ONLY = {"read_file", "read_file_largest", "read_file_range", "list_directory", "list_directory_recursive",
+             "search_files_by_name", "search_files_by_content", "rank_search", "code_outline", "find_symbol"}
+
+
+def clear_caches(drop_os_cache: bool):
+    read_cache.clear()
+    symbol_index._indexes.clear()
+    search_index._indexes.clear()
+    shutil.rmtree(Path.home() / ".openagentcli" / "index", ignore_errors=True)
+    if drop_os_cache:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+
+
+def time_call(fn, args: dict) -> float:
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        fn(**args)
+        return time.perf_counter() - start
+
+
+async def load_test(name: str, make_args, concurrency: int, calls: int) -> dict:
+    """`calls` invocations through mcp.call_tool with at most `concurrency` in flight.
+
+    FastMCP runs sync tools inline on the event loop, so each call gets its own
+    worker thread (and event loop) to make the calls actually overlap.
+    """
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(concurrency))
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    def call(args: dict):
+        asyncio.run(mcp_server.mcp.call_tool(name, args))
+
+    async def one():
+        async with semaphore:
+            args = make_args()
+            start = time.perf_counter()
+            await asyncio.to_thread(call, args)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    return dict(percentiles(latencies), throughput=calls / elapsed, concurrency=concurrency)
+
+
+def run_shape(shape: str, args, drop_os_cache: bool) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / shape
+        manifest = make_tree(root, shape, args.scale)
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            cases = tool_cases(manifest, Scratch(manifest))
+            for case, (name, make_args) in cases.items():
+                if args.tools and case not in args.tools:
+                    continue
+                fn = getattr(mcp_server, name)
+                cold = []
+                for _ in range(args.cold):
+                    clear_caches(drop_os_cache)
+                    cold.append(time_call(fn, make_args()))
+                time_call(fn, make_args())
+                warm = [time_call(fn, make_args()) for _ in range(args.warm)]
+                results[f"{shape}/{case}/cold"] = percentiles(cold)
+                results[f"{shape}/{case}/warm"] = percentiles(warm)
+                print(f"{shape:>7} {case:<26} cold p50 {results[f'{shape}/{case}/cold']['p50'] * 1000:9.2f} ms"
+                      f"   warm p50 {results[f'{shape}/{case}/warm']['p50'] * 1000:9.2f} ms", file=sys.stderr)
+
+                if case not in READ_ONLY:
+                    continue
+                for level in args.concurrency:
+                    result = asyncio.run(load_test(name, make_args, level, args.load_calls))
+                    results[f"{shape}/{case}/c{level}"] = result
+                    print(f"{'':>7} {'':<26} c={level:<3} {result['throughput']:9.1f} calls/s   "
+                          f"p99 {result['p99'] * 1000:9.2f} ms", file=sys.stderr)
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float, noise: float) -> int:
+    """Print p50 changes per benchmark; return the number of regressions."""
+    regressions = 0
+    if baseline.get("meta", {}).get("scale") != current.get("meta", {}).get("scale"):
+        print("warning: baseline and current runs used different --scale values\n")
+    print(f"{'benchmark':<48} {'baseline':>11} {'current':>11} {'change':>8}")
+    for key in sorted(set(baseline["results"]) & set(current["results"])):
+        before, after = baseline["results"][key]["p50"], current["results"][key]["p50"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold and after - before > noise:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -threshold and before - after > noise:
+            flag = "  improved"
+        print(f"{key:<48} {before * 1000:9.2f}ms {after * 1000:9.2f}ms {change:+8.1%}{flag}")
+    missing = set(baseline["results"]) - set(current["results"])
+    if missing:
+        print(f"\n{len(missing)} baseline benchmarks were not run")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shapes", default=",".join(TREE_SHAPES), help="comma-separated tree shapes")
+    parser.add_argument("--tools", help="comma-separated tool cases to run (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the number/size of files")
+    parser.add_argument("--cold", type=int, default=5, help="cold calls per tool")
+    parser.add_argument("--warm", type=int, default=20, help="warm calls per tool")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated load-test levels")
+    parser.add_argument("--load-calls", type=int, default=64, help="calls per load-test level")
+    parser.add_argument("--drop-caches", action="store_true", help="also drop the OS page cache before cold calls (root only)")
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved results JSON")
+    parser.add_argument("--current", metavar="RESULTS", help="with --compare, use saved results instead of running")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative p50 increase counted as a regression")
+    parser.add_argument("--noise", type=float, default=0.0005, help="absolute p50 increase (s) below which changes are ignored")
+    args = parser.parse_args()
+    args.tools = set(args.tools.split(",")) if args.tools else None
+    args.concurrency = [int(c) for c in args.concurrency.split(",") if c]
+
+    if args.current:
+        current = json.loads(Path(args.current).read_text())
+    else:
+        drop_os_cache = args.drop_caches and os.geteuid() == 0
+        if args.drop_caches and not drop_os_cache:
+            print("--drop-caches needs root; only in-process caches will be cleared", file=sys.stderr)
+        home = tempfile.mkdtemp()
+        # Keep persisted indexes out of the real home directory
+        os.environ["HOME"] = home
+        try:
+            results = {}
+            for shape in args.shapes.split(","):
+                results.update(run_shape(shape, args, drop_os_cache))
+        finally:
+            shutil.rmtree(home, ignore_errors=True)
+        current = {
+            "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                     "scale": args.scale, "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "results": results,
+        }
+        text = json.dumps(current, indent=2)
+        if args.output:
+            Path(args.output).write_text(text + "\n")
+        elif not args.compare:
+            print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        return 1 if compare(baseline, current, args.threshold, args.noise) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Reproducible synthetic source trees for the benchmarks."""
+import random
+from pathlib import Path
+
+WORDS = [
+    "account", "buffer", "cache", "client", "config", "data", "event", "file", "handler", "index",
+    "item", "job", "key", "loader", "message", "node", "parser", "queue", "request", "response",
+    "router", "session", "socket", "store", "stream", "task", "token", "user", "value", "worker",
+]
+
+
+def identifier(rng: random.Random, parts: int = 2, camel: bool = False) -> str:
+    words = [rng.choice(WORDS) for _ in range(parts)]
+    if camel:
+        return words[0] + "".join(w.title() for w in words[1:])
+    return "_".join(words)
+
+
+def python_module(rng: random.Random, classes: int = 3, methods: int = 5) -> str:
+    lines = ["import os", "import json", ""]
+    for _ in range(classes):
+        cls = "".join(w.title() for w in identifier(rng).split("_")) + str(rng.randrange(1000))
+        lines.append(f"class {cls}:")
+        lines.append(f'    """{identifier(rng, 4).replace("_", " ")}."""')
+        for _ in range(methods):
+            name = identifier(rng, 3)
+            arg = identifier(rng, 1)
+            lines.append(f"    def {name}(self, {arg}, retries: int = 3) -> dict:")
+            lines.append(f"        {identifier(rng)} = {arg} * retries")
+            lines.append(f"        return {{'{identifier(rng, 1)}': {arg}}}")
+            lines.append("")
+    for _ in range(methods):
+        lines.append(f"def {identifier(rng, 3)}({identifier(rng, 1)}):")
+        lines.append(f"    return {rng.randrange(100)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def make_python_repo(root: Path, files: int, seed: int = 0, files_per_dir: int = 50) -> Path:
+    """Write `files` Python modules under root, spread across nested packages."""
+    rng = random.Random(seed)
+    for i in range(files):
+        directory = root / f"pkg{i // files_per_dir // 20}" / f"sub{i // files_per_dir}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{identifier(rng)}_{i}.py").write_text(python_module(rng))
+    return root
+
+
+TREE_SHAPES = ("deep", "wide", "small", "huge", "binary")
+
+
+def make_tree(root: Path, shape: str, scale: float = 1.0, seed: int = 0) -> dict:
+    """Write a reproducible tree of the given shape under root and return a manifest.
+
+    deep:   one long chain of nested packages with a few modules per level
+    wide:   a single directory holding many modules
+    small:  many tiny files spread over a shallow tree
+    huge:   a handful of very large text files
+    binary: source files mixed with random binary blobs of similar size
+    """
+    rng = random.Random(seed)
+    text_files, binary_files = [], []
+
+    def write_module(path: Path, classes: int = 3, methods: int = 5):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(python_module(rng, classes, methods))
+        text_files.append(str(path.relative_to(root)))
+
+    if shape == "deep":
+        directory = root
+        for level in range(int(40 * scale) or 1):
+            directory = directory / f"level{level}_{identifier(rng, 1)}"
+            for i in range(3):
+                write_module(directory / f"{identifier(rng)}_{i}.py")
+    elif shape == "wide":
+        for i in range(int(3000 * scale) or 1):
+            write_module(root / "flat" / f"{identifier(rng)}_{i}.py")
+    elif shape == "small":
+        for i in range(int(5000 * scale) or 1):
+            write_module(root / f"d{i % 50}" / f"{identifier(rng, 1)}_{i}.py", classes=0, methods=1)
+    elif shape == "huge":
+        for i in range(3):
+            path = root / "data" / f"{identifier(rng)}_{i}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                for _ in range(int(400 * scale) or 1):
+                    f.write(python_module(rng, classes=10, methods=8))
+            text_files.append(str(path.relative_to(root)))
+    elif shape == "binary":
+        for i in range(int(1000 * scale) or 1):
+            directory = root / f"pkg{i // 100}"
+            if i % 2:
+                path = directory / f"{identifier(rng)}_{i}.bin"
+                directory.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(rng.randbytes(rng.randrange(1024, 64 * 1024)))
+                binary_files.append(str(path.relative_to(root)))
+            else:
+                write_module(directory / f"{identifier(rng)}_{i}.py")
+    else:
+        raise ValueError(f"unknown tree shape '{shape}'")
+
+    return {"shape": shape, "root": str(root), "text_files": text_files, "binary_files": binary_files}
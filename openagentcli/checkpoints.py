@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import errno
+import fcntl
+import shutil
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+# ioctl that makes dst share src's extents (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+REFLINK_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+CHUNK_SIZE = 1 << 20
+MAX_SESSION_AGE_DAYS = 7
+
+@dataclass
+class FileState:
+    digest: Optional[str]  # None: the file did not exist
+    mode: int = 0o644
+
+@dataclass
+class Checkpoint:
+    id: int
+    created: float
+    label: str
+    files: dict[str, FileState] = field(default_factory=dict)
+
+class CheckpointStore:
+    """Per-session snapshots of the files edit tools are about to change.
+
+    File contents live in a content-addressed object store shared by all
+    sessions (objects/<sha256>), so unchanged content is stored once. Objects
+    are written as reflinks of the original file where the filesystem supports
+    it, and as plain copies otherwise. Rolling back only touches the files
+    recorded in the affected checkpoints.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or Path.home() / ".openagentcli" / "checkpoints"
+        self.objects = self.root / "objects"
+        self.sessions = self.root / "sessions"
+        self.session = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.checkpoints: list[Checkpoint] = []
+        self.stat_cache: dict[str, tuple[int, int, int, str]] = {}
+        self.reflink_ok: dict[int, bool] = {}
+        self.lock = threading.Lock()
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.sessions.mkdir(parents=True, exist_ok=True)
+        self.prune()
+
+    def _object(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def _clone(self, src: BinaryIO, dst: BinaryIO, device: int) -> bool:
+        """Try to reflink src into dst; remembers per device whether it works."""
+        if self.reflink_ok.get(device) is False:
+            return False
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError as e:
+            if e.errno not in REFLINK_UNSUPPORTED:
+                raise
+            self.reflink_ok[device] = False
+            return False
+        self.reflink_ok[device] = True
+        return True
+
+    def _store(self, path: str, st: os.stat_result) -> str:
+        """Add a file's content to the object store and return its digest."""
+        cached = self.stat_cache.get(path)
+        if cached and cached[:3] == (st.st_ino, st.st_mtime_ns, st.st_size) and self._object(cached[3]).exists():
+            return cached[3]
+
+        tmp = self.objects / f"tmp-{os.getpid()}-{threading.get_ident()}"
+        digest = hashlib.sha256()
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            if self._clone(src, dst, st.st_dev):
+                while chunk := src.read(CHUNK_SIZE):
+                    digest.update(chunk)
+            else:
+                # Hash and copy in a single pass over the file
+                while chunk := src.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    dst.write(chunk)
+        digest = digest.hexdigest()
+
+        obj = self._object(digest)
+        if obj.exists():
+            tmp.unlink()
+        else:
+            obj.parent.mkdir(exist_ok=True)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, obj)
+        self.stat_cache[path] = (st.st_ino, st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def snapshot(self, label: str, paths: list[str]) -> Checkpoint:
+        """Record the current content of paths (missing files included) as a new checkpoint."""
+        with self.lock:
+            checkpoint = Checkpoint(len(self.checkpoints) + 1, time.time(), label)
+            for path in paths:
+                path = os.path.realpath(path)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    checkpoint.files[path] = FileState(None)
+                    continue
+                checkpoint.files[path] = FileState(self._store(path, st), st.st_mode & 0o7777)
+            self.checkpoints.append(checkpoint)
+            with open(self.sessions / f"{self.session}.jsonl", "a") as f:
+                f.write(json.dumps({
+                    "id": checkpoint.id, "created": checkpoint.created, "label": checkpoint.label,
+                    "files": {p: [s.digest, s.mode] for p, s in checkpoint.files.items()},
+                }) + "\n")
+            return checkpoint
+
+    def _restore(self, path: str, state: FileState):
+        if state.digest is None:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return
+        target = Path(path)
+        # The file's directory may have been removed since the checkpoint
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.openagentcli-restore")
+        with open(self._object(state.digest), "rb") as src, open(tmp, "wb") as dst:
+            if not self._clone(src, dst, os.fstat(dst.fileno()).st_dev):
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        os.chmod(tmp, state.mode)
+        os.replace(tmp, target)
+
+    def rollback(self, checkpoint_id: int) -> list[str]:
+        """Restore every file changed since checkpoint_id to its state at that checkpoint.
+
+        The current state is checkpointed first, so a rollback can itself be undone.
+        """
+        targets = [c for c in self.checkpoints if c.id >= checkpoint_id]
+        if not targets:
+            raise ValueError(f"no checkpoint #{checkpoint_id}")
+        states: dict[str, FileState] = {}
+        for checkpoint in reversed(targets):
+            # Iterating newest to oldest leaves the oldest (pre-change) state per file
+            states.update(checkpoint.files)
+        # Check every object up front so a missing one cannot leave a half-applied rollback
+        missing = [path for path, state in states.items() if state.digest and not self._object(state.digest).exists()]
+        if missing:
+            raise ValueError(f"stored content missing for {', '.join(missing)}; no files were changed")
+        self.snapshot(f"before rollback to #{checkpoint_id}", list(states))
+        for path, state in states.items():
+            self._restore(path, state)
+        return list(states)
+
+    def prune(self, max_age_days: int = MAX_SESSION_AGE_DAYS):
+        """Delete old session logs and objects no remaining session refers to."""
+        cutoff = time.time() - max_age_days * 86400
+        referenced = set()
+        for log in self.sessions.glob("*.jsonl"):
+            try:
+                if log.stat().st_mtime < cutoff:
+                    log.unlink()
+                    continue
+                for line in log.read_text().splitlines():
+                    referenced.update(d for d, _ in json.loads(line)["files"].values() if d)
+            except (OSError, ValueError, KeyError):
+                continue
+        for obj in self.objects.glob("*/*"):
+            if obj.parent.name + obj.name not in referenced and obj.stat().st_mtime < cutoff:
+                obj.unlink()
@@ -0,0 +1,162 @@
+import json
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Optional
+from openagentcli.models.base import BaseModel
+from openagentcli.models.scheduler import Priority, request_priority
+from openagentcli.protocol import Message, Role
+
+SUMMARY_PROMPT = """Summarize the earlier part of a conversation between a user and a coding assistant. The summary replaces these messages in the assistant's context, so keep everything needed to continue the work:
+- what the user asked for and any constraints or preferences they stated
+- decisions made and their reasons
+- files that were read, created or changed (with paths) and the key facts learned from them
+- commands that were run and their outcomes
+- open problems and next steps
+Be concise and factual. Do not address the user.
+
+{previous}<conversation>
+{transcript}
+</conversation>"""
+
+# Tool results longer than this are cut in the transcript sent for summarization
+MAX_RESULT_CHARS = 2000
+
+@dataclass
+class Summary:
+    text: str
+    count: int
+    tool_call_ids: set[str]
+    replaced_chars: int
+
+def message_digest(msg: Message) -> bytes:
+    tool_calls = [(tc.id, tc.name, tc.arguments) for tc in msg.tool_calls or []]
+    data = json.dumps([msg.role.value, msg.content, msg.tool_call_id, msg.tool_plan, tool_calls], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).digest()
+
+def transcript(messages: list[Message]) -> str:
+    names = {}
+    lines = []
+    for msg in messages:
+        if msg.role == Role.USER:
+            lines.append(f"User: {msg.content}")
+        elif msg.role == Role.TOOL:
+            content = msg.content or ""
+            if len(content) > MAX_RESULT_CHARS:
+                content = content[:MAX_RESULT_CHARS] + f"... [{len(content) - MAX_RESULT_CHARS} more characters]"
+            lines.append(f"Result of {names.get(msg.tool_call_id, 'tool')}: {content}")
+        elif msg.tool_calls:
+            if msg.tool_plan:
+                lines.append(f"Assistant: {msg.tool_plan}")
+            for tc in msg.tool_calls:
+                names[tc.id] = tc.name
+                lines.append(f"Assistant called {tc.name}({json.dumps(tc.arguments)})")
+        elif msg.content:
+            lines.append(f"{msg.role.value.title()}: {msg.content}")
+    return "\n".join(lines)
+
+class HistoryCompactor:
+    """Summarizes older completed turns in the background while the user is idle.
+
+    Summaries are cached by the hash of the messages they replace and only
+    swapped into the outgoing request when that exact prefix is still in the
+    history, so the stored chat is never modified and a foreground request
+    never waits for a summary.
+    """
+
+    def __init__(self, model: BaseModel, keep_turns: int = 4, min_chars: int = 20000):
+        self.model = model
+        self.keep_turns = keep_turns
+        self.min_chars = min_chars
+        self.summaries: dict[bytes, Summary] = {}
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.failures = 0
+        # id(message) -> (message, digest); the message is kept so a reused id is detected
+        self._digests: dict[int, tuple[Message, bytes]] = {}
+
+    def _boundaries(self, messages: list[Message]) -> list[tuple[int, bytes]]:
+        """(index, hash of messages[:index]) for every user message after the first."""
+        running = hashlib.sha256()
+        boundaries = []
+        cached = self._digests
+        digests = {}
+        for i, msg in enumerate(messages):
+            if msg.role == Role.USER and i > 0:
+                boundaries.append((i, running.digest()))
+            entry = cached.get(id(msg))
+            if entry is None or entry[0] is not msg:
+                entry = (msg, message_digest(msg))
+            digests[id(msg)] = entry
+            running.update(entry[1])
+        # Only messages still in the history stay cached
+        self._digests = digests
+        return boundaries
+
+    def _latest(self, boundaries: list[tuple[int, bytes]]) -> Optional[Summary]:
+        with self.lock:
+            for index, key in reversed(boundaries):
+                summary = self.summaries.get(key)
+                if summary is not None and summary.count == index:
+                    return summary
+        return None
+
+    def schedule(self, messages: list[Message]):
+        """Start summarizing older turns of messages if there is enough to gain."""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._run, args=(list(messages),), name="compaction", daemon=True)
+        self.thread.start()
+
+    def _run(self, messages: list[Message]):
+        boundaries = self._boundaries(messages)
+        if len(boundaries) < self.keep_turns:
+            return
+        index, key = boundaries[-self.keep_turns]
+        with self.lock:
+            if key in self.summaries:
+                return
+        previous = self._latest(boundaries[:-self.keep_turns])
+        start = previous.count if previous else 0
+        replaced_chars = sum(m.size for m in messages[start:index])
+        if replaced_chars < self.min_chars:
+            return
+
+        prompt = SUMMARY_PROMPT.format(
+            previous=f"<earlier_summary>\n{previous.text}\n</earlier_summary>\n\n" if previous else "",
+            transcript=transcript(messages[start:index]),
+        )
+        try:
+            with request_priority(Priority.BACKGROUND):
+                response = self.model.chat([Message(role=Role.USER, content=prompt)], [])
+        except Exception:
+            self.failures += 1
+            return
+        if not response.content:
+            return
+
+        tool_call_ids = {m.tool_call_id for m in messages[start:index] if m.tool_call_id}
+        if previous:
+            tool_call_ids |= previous.tool_call_ids
+            replaced_chars += previous.replaced_chars
+        with self.lock:
+            self.summaries[key] = Summary(response.content, index, tool_call_ids, replaced_chars)
+
+    def apply(self, messages: list[Message]) -> tuple[list[Message], Optional[Summary]]:
+        """Replace the longest summarized prefix of messages with its summary."""
+        summary = self._latest(self._boundaries(messages))
+        if summary is None:
+            return messages, None
+        synthetic = Message(role=Role.SYSTEM, content=f"<conversation_summary>\nSummary of the earlier conversation:\n{summary.text}\n</conversation_summary>")
+        return [synthetic] + messages[summary.count:], summary
+
+    def stats(self) -> dict:
+        with self.lock:
+            best = max(self.summaries.values(), key=lambda s: s.count, default=None)
+            return {
+                "summaries": len(self.summaries),
+                "replaced_chars": best.replaced_chars if best else 0,
+                "summary_chars": len(best.text) if best else 0,
+                "running": self.thread is not None and self.thread.is_alive(),
+                "failures": self.failures,
+            }
@@ -32,6 +32,10 @@ def load_model(config: dict):
         print(f"{Colors.DIM}  class_name: CohereModel{Colors.RESET}\n")
         exit(1)
     
+    return build_model(model_config, config.get('custom_instructions'))
+
+def build_model(model_config: dict, custom_instructions: str = None):
+    """Instantiate the model class described by a model_config block."""
     if not isinstance(model_config, dict):
         print(f"\n{Colors.ERROR}'model_config' must be a dictionary{Colors.RESET}")
         print(f"{Colors.DIM}Check your config.yaml indentation.{Colors.RESET}\n")
@@ -50,7 +54,8 @@ def load_model(config: dict):
         print(f"{Colors.DIM}Add: class_name: YourModelClass{Colors.RESET}\n")
         exit(1)
     
-    custom_instructions = config.get('custom_instructions')
+    # Any other keys in model_config are passed to the model class as options
+    options = {k: v for k, v in model_config.items() if k not in ('file_name', 'class_name')}
     
     try:
         module = importlib.import_module(f'openagentcli.models.{model_file}')
@@ -66,4 +71,102 @@ def load_model(config: dict):
         print(f"{Colors.DIM}Check your config.yaml and ensure the class name is correct.{Colors.RESET}\n")
         exit(1)
     
-    return model_cls(custom_instructions=custom_instructions)
+    return model_cls(custom_instructions=custom_instructions, **options)
+
+def load_mcp_servers(config: dict) -> list[dict]:
+    servers = config.get('mcp_servers') or []
+    
+    if not isinstance(servers, list):
+        print(f"\n{Colors.ERROR}'mcp_servers' must be a list{Colors.RESET}")
+        print(f"{Colors.DIM}Check your config.yaml indentation.{Colors.RESET}\n")
+        exit(1)
+    
+    names = set()
+    for server in servers:
+        if not isinstance(server, dict) or not server.get('name') or not server.get('command'):
+            print(f"\n{Colors.ERROR}Each entry in 'mcp_servers' needs a 'name' and a 'command'{Colors.RESET}")
+            print(f"{Colors.DIM}Expected structure:{Colors.RESET}")
+            print(f"{Colors.DIM}mcp_servers:{Colors.RESET}")
+            print(f"{Colors.DIM}  - name: my_server{Colors.RESET}")
+            print(f"{Colors.DIM}    command: python{Colors.RESET}")
+            print(f"{Colors.DIM}    args: [\"-m\", \"my_server\"]{Colors.RESET}\n")
+            exit(1)
+        
+        name = str(server['name'])
+        if not name.replace('_', '').replace('-', '').isalnum():
+            print(f"\n{Colors.ERROR}Invalid MCP server name '{name}'{Colors.RESET}")
+            print(f"{Colors.DIM}Use only letters, digits, '-' and '_'.{Colors.RESET}\n")
+            exit(1)
+        
+        if name in names:
+            print(f"\n{Colors.ERROR}Duplicate MCP server name '{name}'{Colors.RESET}\n")
+            exit(1)
+        names.add(name)
+        
+        timeout = server.get('call_timeout')
+        if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0):
+            print(f"\n{Colors.ERROR}'call_timeout' of MCP server '{name}' must be a positive number of seconds{Colors.RESET}\n")
+            exit(1)
+    
+    return servers
+
+def load_rate_limits(config: dict) -> dict:
+    rate_limits = config.get('rate_limits') or {}
+    allowed = ('requests_per_minute', 'tokens_per_minute', 'max_concurrency', 'per_model_concurrency', 'max_retries')
+    
+    if not isinstance(rate_limits, dict):
+        print(f"\n{Colors.ERROR}'rate_limits' must be a mapping{Colors.RESET}")
+        print(f"{Colors.DIM}Check your config.yaml indentation.{Colors.RESET}\n")
+        exit(1)
+    
+    unknown = [key for key in rate_limits if key not in allowed]
+    if unknown:
+        print(f"\n{Colors.ERROR}Unknown 'rate_limits' option '{unknown[0]}'{Colors.RESET}")
+        print(f"{Colors.DIM}Valid options: {', '.join(allowed)}{Colors.RESET}\n")
+        exit(1)
+    
+    return rate_limits
+
+def load_compaction(config: dict) -> dict | None:
+    compaction = config.get('compaction')
+    if compaction is None or compaction is False:
+        return None
+    if compaction is True:
+        compaction = {}
+    allowed = ('model_config', 'keep_turns', 'min_chars')
+    
+    if not isinstance(compaction, dict):
+        print(f"\n{Colors.ERROR}'compaction' must be a mapping{Colors.RESET}")
+        print(f"{Colors.DIM}Check your config.yaml indentation.{Colors.RESET}\n")
+        exit(1)
+    
+    unknown = [key for key in compaction if key not in allowed]
+    if unknown:
+        print(f"\n{Colors.ERROR}Unknown 'compaction' option '{unknown[0]}'{Colors.RESET}")
+        print(f"{Colors.DIM}Valid options: {', '.join(allowed)}{Colors.RESET}\n")
+        exit(1)
+    
+    return compaction
+
+def load_tool_selection(config: dict) -> dict:
+    selection = config.get('tool_selection')
+    if selection is None:
+        return {}
+    allowed = ('enabled', 'core', 'max_tools')
+    
+    if not isinstance(selection, dict):
+        print(f"\n{Colors.ERROR}'tool_selection' must be a mapping{Colors.RESET}")
+        print(f"{Colors.DIM}Check your config.yaml indentation.{Colors.RESET}\n")
+        exit(1)
+    
+    unknown = [key for key in selection if key not in allowed]
+    if unknown:
+        print(f"\n{Colors.ERROR}Unknown 'tool_selection' option '{unknown[0]}'{Colors.RESET}")
+        print(f"{Colors.DIM}Valid options: {', '.join(allowed)}{Colors.RESET}\n")
+        exit(1)
+    
+    if 'core' in selection and not isinstance(selection['core'], list):
+        print(f"\n{Colors.ERROR}'tool_selection.core' must be a list of tool names{Colors.RESET}\n")
+        exit(1)
+    
+    return selection
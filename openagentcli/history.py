@@ -0,0 +1,126 @@
+import os
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+from openagentcli.protocol import Message, ProtocolAdapter, Role
+
+EDIT_TOOLS = {"create_file", "overwrite_file", "replace_exact_in_file"}
+
+@dataclass
+class FileSnapshot:
+    path: str
+    digest: str
+    turn: int
+    seq: int
+
+class FileSnapshotTracker:
+    """Tracks which tool results in the history are full copies of a file.
+
+    Older copies of a file are replaced by a one-line stub in the outgoing
+    request once a newer read exists or the file has been edited since, and a
+    re-read of an unchanged file returns a reference to the earlier read.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.snapshots: dict[str, FileSnapshot] = {}
+        self.latest: dict[str, str] = {}
+        self.edited_at: dict[str, int] = {}
+        # "unchanged" stub tool_call_id -> (id of the read it points to, snapshot at the time of the stub)
+        self.references: dict[str, tuple[str, FileSnapshot]] = {}
+        # Stubs whose read was summarized away -> the message holding the full content
+        self.expanded: dict[str, Message] = {}
+        self.turn = 0
+        self.seq = 0
+
+    def new_turn(self):
+        self.turn += 1
+
+    def record_result(self, tool_name: str, args: dict, tool_call_id: str, result: Any) -> Any:
+        """Record a successful tool result; returns the result to hand to the model."""
+        self.seq += 1
+        path = args.get("path")
+        if not isinstance(path, str):
+            return result
+        key = os.path.realpath(path)
+
+        if tool_name in EDIT_TOOLS:
+            self.edited_at[key] = self.seq
+            return result
+        if tool_name != "read_file" or not isinstance(result, str):
+            return result
+        if args.get("start_line") or args.get("end_line"):
+            # Partial reads are not full snapshots of the file
+            return result
+
+        digest = hashlib.sha256(result.encode()).hexdigest()
+        latest_id = self.latest.get(key)
+        if latest_id is not None:
+            latest = self.snapshots[latest_id]
+            if latest.digest == digest and self.edited_at.get(key, 0) < latest.seq:
+                self.references[tool_call_id] = (latest_id, FileSnapshot(key, digest, self.turn, self.seq))
+                return f"[{path} unchanged since turn {latest.turn}; see the earlier read_file result]"
+
+        self.snapshots[tool_call_id] = FileSnapshot(key, digest, self.turn, self.seq)
+        self.latest[key] = tool_call_id
+        return result
+
+    def mark_edited(self, paths: list[str]):
+        """Treat paths as edited outside a tool call (e.g. restored by a rollback)."""
+        self.seq += 1
+        for path in paths:
+            self.edited_at[os.path.realpath(path)] = self.seq
+
+    def forget(self, tool_call_ids: set[str], messages: list[Message]):
+        """Stop tracking snapshots whose messages are no longer sent to the model.
+
+        Surviving "unchanged" stubs that point at a forgotten read are expanded
+        back to the read's content (looked up in messages, the full history),
+        so the request never refers to a result that is not in it.
+        """
+        orphaned = sorted(
+            (snapshot.seq, stub_id, target) for stub_id, (target, snapshot) in self.references.items()
+            if target in tool_call_ids and stub_id not in tool_call_ids
+        )
+        targets = {target for _, _, target in orphaned}
+        originals = {target: self.expanded[target] for target in targets if target in self.expanded}
+        originals.update((m.tool_call_id, m) for m in messages if m.tool_call_id in targets and m.tool_call_id not in originals)
+
+        for tool_call_id in tool_call_ids:
+            self.references.pop(tool_call_id, None)
+            self.expanded.pop(tool_call_id, None)
+            snapshot = self.snapshots.pop(tool_call_id, None)
+            if snapshot and self.latest.get(snapshot.path) == tool_call_id:
+                del self.latest[snapshot.path]
+
+        promoted: dict[str, str] = {}
+        for _, stub_id, target in orphaned:
+            _, snapshot = self.references.pop(stub_id)
+            if target in promoted:
+                # Later stubs of the same read now point at the expanded one
+                self.references[stub_id] = (promoted[target], snapshot)
+            elif target in originals:
+                self.expanded[stub_id] = originals[target]
+                self.snapshots[stub_id] = snapshot
+                self.latest.setdefault(snapshot.path, stub_id)
+                promoted[target] = stub_id
+
+    def compact(self, messages: list[Message], adapter: ProtocolAdapter) -> list[Message]:
+        """Return messages with stale file snapshots replaced by short stubs."""
+        compacted = []
+        for msg in messages:
+            snapshot = self.snapshots.get(msg.tool_call_id) if msg.role == Role.TOOL else None
+            reason = None
+            if snapshot is not None:
+                if self.latest.get(snapshot.path) != msg.tool_call_id:
+                    reason = "superseded by later read"
+                elif self.edited_at.get(snapshot.path, 0) > snapshot.seq:
+                    reason = "file edited since this read"
+            if reason:
+                msg = adapter.to_tool_result(msg.tool_call_id, f"[read_file {snapshot.path}: {reason}]")
+            elif msg.role == Role.TOOL and msg.tool_call_id in self.expanded:
+                msg = Message(role=Role.TOOL, tool_call_id=msg.tool_call_id, content=self.expanded[msg.tool_call_id].content)
+            compacted.append(msg)
+        return compacted
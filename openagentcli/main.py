@@ -1,9 +1,22 @@
 import asyncio
 import os
+import time
+import argparse
 import readline
 import logging
-from openagentcli.config import load_config, load_model
-from openagentcli.server.mcp_server import mcp
+from openagentcli.config import load_config, load_model, build_model, load_mcp_servers, load_rate_limits, load_compaction, load_tool_selection
+from openagentcli.models.scheduler import configure_scheduler, get_scheduler
+from openagentcli.server.mcp_server import mcp, shell_pool
+from openagentcli.mcp_pool import MCPServerPool
+from openagentcli.prefetch import Prefetcher
+from openagentcli.history import FileSnapshotTracker
+from openagentcli.checkpoints import CheckpointStore
+from openagentcli.compaction import HistoryCompactor
+from openagentcli.tool_selection import ToolSelector
+from openagentcli.server.read_cache import read_cache
+from openagentcli.server.search_index import notify_changed
+from openagentcli.server.jobs import job_table
+from openagentcli.profiler import profiler
 from openagentcli.ui import Colors, Spinner
 from openagentcli.chat_storage import ChatStorage
 from openagentcli.tool_executor import ToolExecutor
@@ -15,12 +28,31 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 class AgentCLI:
     def __init__(self):
         config = load_config()
+        configure_scheduler(load_rate_limits(config))
         self.model = load_model(config)
         self.messages: list[Message] = []
-        self.tools: list[ToolDefinition] = asyncio.run(self._get_tools())
+        self.mcp_pool = MCPServerPool(load_mcp_servers(config))
+        self.tools: list[ToolDefinition] = asyncio.run(self._get_tools()) + self.mcp_pool.start()
         functions_map = asyncio.run(self._get_functions())
-        self.executor = ToolExecutor(functions_map, self.model.adapter)
+        functions_map.update(self.mcp_pool.functions_map())
+        selection = load_tool_selection(config)
+        if selection.get('enabled', True):
+            self.tool_selector = ToolSelector(self.tools, self.model.adapter, selection.get('core'), selection.get('max_tools', 12))
+        else:
+            self.tool_selector = ToolSelector(self.tools, self.model.adapter, [t.name for t in self.tools], len(self.tools))
+        self.snapshots = FileSnapshotTracker()
+        self.checkpoints = CheckpointStore()
+        self.executor = ToolExecutor(functions_map, self.model.adapter, self.snapshots, self.checkpoints)
+        self.rollback_note: str | None = None
         self.storage = ChatStorage()
+        self.prefetcher = Prefetcher()
+        self.compactor = None
+        compaction = load_compaction(config)
+        if compaction is not None:
+            summarizer = self.model
+            if compaction.get('model_config'):
+                summarizer = build_model(compaction['model_config'], config.get('custom_instructions'))
+            self.compactor = HistoryCompactor(summarizer, compaction.get('keep_turns', 4), compaction.get('min_chars', 20000))
         
         readline.parse_and_bind(r'"\e[A": previous-history')
         readline.parse_and_bind(r'"\e[B": next-history')
@@ -38,6 +70,178 @@ class AgentCLI:
     async def _get_functions(self):
         return {name: tool.fn for name, tool in mcp._tool_manager._tools.items()}
     
+    def build_request(self) -> list[Message]:
+        """Messages to send to the model for the next request."""
+        messages = self.messages
+        if self.compactor:
+            messages, summary = self.compactor.apply(messages)
+            if summary:
+                self.snapshots.forget(summary.tool_call_ids, self.messages)
+        return self.snapshots.compact(messages, self.model.adapter)
+    
+    def print_stats(self):
+        cache = read_cache.stats()
+        print(f"\n{Colors.BOLD}Read Cache:{Colors.RESET}")
+        print(f"  {cache['entries']} files, {cache['bytes'] / 1024:.1f} KiB cached")
+        print(f"  {cache['hits']} hits, {cache['misses']} misses {Colors.DIM}({cache['hit_rate']:.0%} hit rate){Colors.RESET}")
+        print(f"  {cache['prefetched']} files prefetched, {cache['prefetch_hits']} prefetch hits")
+        print(f"  {Colors.DIM}~{cache['seconds_saved'] * 1000:.1f} ms of disk reads saved{Colors.RESET}")
+        
+        tools = self.tool_selector.stats()
+        if tools['last']:
+            print(f"\n{Colors.BOLD}Tool Schemas:{Colors.RESET}")
+            print(f"  last request: {tools['last']['tools']} of {tools['last']['total']} tools, {tools['last']['bytes'] / 1024:.1f} KiB "
+                  f"{Colors.DIM}(all tools, unminified: {tools['full_bytes'] / 1024:.1f} KiB){Colors.RESET}")
+            saved = 1 - tools['bytes_sent'] / tools['bytes_full'] if tools['bytes_full'] else 0
+            print(f"  {tools['requests']} requests, {(tools['bytes_full'] - tools['bytes_sent']) / 1024:.1f} KiB of tool schemas saved {Colors.DIM}({saved:.0%}){Colors.RESET}")
+        
+        if self.compactor:
+            compaction = self.compactor.stats()
+            print(f"\n{Colors.BOLD}History Compaction:{Colors.RESET}")
+            if compaction['summaries']:
+                print(f"  {compaction['replaced_chars']} characters of older turns replaced by a {compaction['summary_chars']}-character summary")
+            else:
+                print(f"  {Colors.DIM}No summaries yet{Colors.RESET}")
+            if compaction['running']:
+                print(f"  {Colors.DIM}Summarizing in the background...{Colors.RESET}")
+            if compaction['failures']:
+                print(f"  {Colors.WARNING}{compaction['failures']} summary requests failed{Colors.RESET}")
+        
+        requests = get_scheduler().stats()
+        print(f"\n{Colors.BOLD}Model Requests:{Colors.RESET}")
+        print(f"  {requests['completed']} completed, {requests['rate_limited']} rate limited (429), {requests['queued']} queued")
+        for priority, wait in requests['wait'].items():
+            if wait['count']:
+                print(f"  {priority}: queue wait p50 {wait['p50'] * 1000:.0f} ms, p95 {wait['p95'] * 1000:.0f} ms {Colors.DIM}({wait['count']} requests){Colors.RESET}")
+        if requests['rate_scale'] < 1:
+            print(f"  {Colors.WARNING}Backing off: sending at {requests['rate_scale']:.0%} of the configured rate{Colors.RESET}")
+        print()
+    
+    def print_jobs(self):
+        jobs = [job.status() for job in job_table.jobs.values()]
+        if not jobs:
+            print(f"\n{Colors.DIM}No background jobs{Colors.RESET}\n")
+            return
+        
+        print(f"\n{Colors.BOLD}Background Jobs:{Colors.RESET}")
+        for job in jobs:
+            if job['status'] == 'running':
+                state = f"{Colors.WARNING}running{Colors.RESET}"
+            elif job['returncode'] == 0:
+                state = f"{Colors.SUCCESS}exited 0{Colors.RESET}"
+            else:
+                state = f"{Colors.ERROR}exited {job['returncode']}{Colors.RESET}"
+            print(f"  {Colors.BOLD}{job['job_id']}{Colors.RESET} {state} {Colors.DIM}({job['elapsed']:.0f}s, {job['output_bytes']} bytes){Colors.RESET} {job['command']}")
+        print()
+    
+    def print_checkpoints(self):
+        if not self.checkpoints.checkpoints:
+            print(f"\n{Colors.DIM}No checkpoints yet{Colors.RESET}\n")
+            return
+        
+        print(f"\n{Colors.BOLD}Checkpoints:{Colors.RESET}")
+        for checkpoint in self.checkpoints.checkpoints:
+            stamp = time.strftime('%H:%M:%S', time.localtime(checkpoint.created))
+            paths = ", ".join(os.path.relpath(p) for p in checkpoint.files)
+            print(f"  {Colors.BOLD}#{checkpoint.id}{Colors.RESET} {Colors.DIM}{stamp}{Colors.RESET} {Colors.TOOL}{checkpoint.label}{Colors.RESET} {paths}")
+        print(f"{Colors.DIM}/rollback <n> restores the files to their state before checkpoint n{Colors.RESET}\n")
+    
+    def rollback(self, checkpoint_id: int):
+        print(f"{Colors.WARNING}Restore files changed since checkpoint #{checkpoint_id}? (y/n): {Colors.RESET}", end='')
+        if input().strip().lower() != 'y':
+            print(f"\n{Colors.DIM}Rollback cancelled{Colors.RESET}\n")
+            return
+        try:
+            restored = self.checkpoints.rollback(checkpoint_id)
+        except (ValueError, OSError) as e:
+            print(f"\n{Colors.ERROR}Rollback failed: {e}{Colors.RESET}\n")
+            return
+        for path in restored:
+            read_cache.invalidate(path)
+            notify_changed(path)
+        self.snapshots.mark_edited(restored)
+        paths = ", ".join(os.path.relpath(p) for p in restored)
+        # Tell the model on the next message, so it does not rely on the undone edits
+        self.rollback_note = f"[The user rolled back your file changes since checkpoint #{checkpoint_id}; these files were restored: {paths}]"
+        print(f"\n{Colors.SUCCESS}✓ Restored {len(restored)} file(s){Colors.RESET} {Colors.DIM}{paths}{Colors.RESET}")
+        print(f"{Colors.DIM}Undo with /rollback {self.checkpoints.checkpoints[-1].id}{Colors.RESET}\n")
+    
+    def run_turn(self):
+        """Let the model respond to the latest user message, running its tool calls."""
+        while True:
+            spinner = Spinner()
+            spinner.start()
+            self.prefetcher.start(self.messages)
+            results: dict[str, Message] = {}
+            inline = True
+            response = None
+            try:
+                request = self.build_request()
+                for event in self.model.stream_events(request, self.tool_selector.select(request)):
+                    if event.message is not None:
+                        response = event.message
+                        continue
+                    # Run trusted calls while the rest of the response is still streaming;
+                    # after a call that needs confirmation, keep the original order.
+                    inline = inline and event.tool_call.name in self.executor.trusted_tools
+                    if not inline:
+                        continue
+                    spinner.stop()
+                    if not results and event.tool_plan:
+                        print(f"\n{Colors.ASSISTANT}> {Colors.RESET}{event.tool_plan}")
+                    tc = event.tool_call
+                    results[tc.id] = self.executor.execute_tool(tc.name, tc.arguments, tc.id)
+                    spinner.start()
+            except KeyboardInterrupt:
+                spinner.stop()
+                print(f"\n{Colors.DIM}Interrupted{Colors.RESET}\n")
+                return
+            except Exception as e:
+                spinner.stop()
+                print(f"\n{Colors.ERROR}Model request failed: {e}{Colors.RESET}\n")
+                return
+            finally:
+                spinner.stop()
+            
+            if not response.tool_calls:
+                print(f"\n{Colors.ASSISTANT}> {Colors.RESET}{response.content}\n")
+                self.messages.append(Message(role=Role.ASSISTANT, content=response.content))
+                return
+            
+            if response.tool_plan and not results:
+                print(f"\n{Colors.ASSISTANT}> {Colors.RESET}{response.tool_plan}")
+            
+            self.messages.append(response)
+            
+            for tc in response.tool_calls:
+                result_msg = results.pop(tc.id, None) or self.executor.execute_tool(tc.name, tc.arguments, tc.id)
+                self.messages.append(result_msg)
+    
+    def print_profile(self, top_n: int = 15):
+        if not profiler.enabled:
+            print(f"\n{Colors.DIM}Profiling is off; start with: openagentcli --profile{Colors.RESET}\n")
+            return
+        summary = profiler.summary(top_n)
+        if not summary['samples']:
+            print(f"\n{Colors.DIM}No samples yet{Colors.RESET}\n")
+            return
+        
+        print(f"\n{Colors.BOLD}Time by turn and tool:{Colors.RESET}")
+        for section, seconds in sorted(summary['sections'].items(), key=lambda item: -item[1]):
+            print(f"  {seconds:8.2f}s  {section}")
+        
+        print(f"\n{Colors.BOLD}Hot functions (self time):{Colors.RESET}")
+        for function, seconds in summary['own']:
+            print(f"  {seconds:8.2f}s  {function}")
+        
+        print(f"\n{Colors.BOLD}Hot functions (total time):{Colors.RESET}")
+        for function, seconds in summary['total']:
+            print(f"  {seconds:8.2f}s  {function}")
+        
+        output_dir = profiler.write()
+        print(f"\n  {Colors.DIM}{summary['samples']} samples, profiler overhead {summary['overhead']:.1%}{Colors.RESET}")
+        print(f"  {Colors.DIM}Collapsed stacks: {output_dir}{Colors.RESET}\n")
+    
     def run(self):
         print(f"\n{Colors.BOLD}OpenAgentCLI{Colors.RESET} {Colors.DIM}v0.1.0{Colors.RESET}")
         print(f"{Colors.DIM}Type /help for commands{Colors.RESET}\n")
@@ -45,6 +249,9 @@ class AgentCLI:
         ctrl_c_waiting = False  # when True, next Ctrl+C on blank input exits
 
         while True:
+            if self.compactor and self.messages:
+                # Summarize older turns while waiting for the user
+                self.compactor.schedule(self.messages)
             try:
                 user_input = input(f"\001{Colors.USER}\002>\001{Colors.RESET}\002 ").strip()
 
@@ -69,6 +276,11 @@ class AgentCLI:
                 print(f"  /help              - Show this help")
                 print(f"  /tools             - List all available tools")
                 print(f"  /tools <name>      - Show details for a specific tool")
+                print(f"  /stats             - Show session performance stats")
+                print(f"  /jobs              - List background shell jobs")
+                print(f"  /profile [n]       - Show the n hottest functions (with --profile)")
+                print(f"  /checkpoints       - List file checkpoints taken before edits")
+                print(f"  /rollback <n>      - Restore files to their state before checkpoint n")
                 print(f"  /save <name>       - Save current chat")
                 print(f"  /load <name>       - Load saved chat")
                 print(f"  /list-saved        - List all saved chats")
@@ -88,6 +300,34 @@ class AgentCLI:
                 display_tool_detail(self.tools, tool_name)
                 continue
             
+            if user_input == '/jobs':
+                self.print_jobs()
+                continue
+            
+            if user_input == '/profile' or user_input.startswith('/profile '):
+                arg = user_input[8:].strip()
+                if arg and not arg.isdigit():
+                    print(f"\n{Colors.ERROR}Usage: /profile [n]{Colors.RESET}\n")
+                else:
+                    self.print_profile(int(arg) if arg else 15)
+                continue
+            
+            if user_input == '/checkpoints':
+                self.print_checkpoints()
+                continue
+            
+            if user_input.startswith('/rollback'):
+                arg = user_input[9:].strip()
+                if arg.isdigit():
+                    self.rollback(int(arg))
+                else:
+                    print(f"\n{Colors.ERROR}Usage: /rollback <n>{Colors.RESET}\n")
+                continue
+            
+            if user_input == '/stats':
+                self.print_stats()
+                continue
+            
             if user_input.startswith('/save '):
                 name = user_input[6:].strip()
                 if name:
@@ -108,6 +348,7 @@ class AgentCLI:
                     messages = self.storage.load(name)
                     if messages is not None:
                         self.messages = messages
+                        self.snapshots.reset()
                 else:
                     print(f"\n{Colors.ERROR}Usage: /load <name>{Colors.RESET}\n")
                 continue
@@ -140,6 +381,7 @@ class AgentCLI:
             
             if user_input == '/clear':
                 self.messages = []
+                self.snapshots.reset()
                 print(f"\n{Colors.DIM}Chat context cleared{Colors.RESET}\n")
                 continue
             
@@ -158,37 +400,37 @@ class AgentCLI:
                 print()
                 continue
             
+            if self.rollback_note:
+                user_input = f"{self.rollback_note}\n\n{user_input}"
+                self.rollback_note = None
             self.messages.append(Message(role=Role.USER, content=user_input))
+            self.snapshots.new_turn()
             
-            while True:
-                spinner = Spinner()
-                spinner.start()
-                try:
-                    response = self.model.chat(self.messages, self.tools)
-                except KeyboardInterrupt:
-                    spinner.stop()
-                    print(f"\n{Colors.DIM}Interrupted{Colors.RESET}\n")
-                    break
-                finally:
-                    spinner.stop()
-                
-                if not response.tool_calls:
-                    print(f"\n{Colors.ASSISTANT}> {Colors.RESET}{response.content}\n")
-                    self.messages.append(Message(role=Role.ASSISTANT, content=response.content))
-                    break
-                
-                if response.tool_plan:
-                    print(f"\n{Colors.ASSISTANT}> {Colors.RESET}{response.tool_plan}")
-                
-                self.messages.append(response)
-                
-                for tc in response.tool_calls:
-                    result_msg = self.executor.execute_tool(tc.name, tc.arguments, tc.id)
-                    self.messages.append(result_msg)
+            with profiler.section(f"turn {self.snapshots.turn}"):
+                self.run_turn()
 
 def main():
-    cli = AgentCLI()
-    cli.run()
+    parser = argparse.ArgumentParser(prog="openagentcli")
+    parser.add_argument("--profile", action="store_true",
+                        help="sample the CLI's stack and write flamegraph-ready profiles to ~/.openagentcli/profiles")
+    parser.add_argument("--profile-interval", type=float, default=5.0, metavar="MS",
+                        help="sampling interval in milliseconds (default: 5)")
+    args = parser.parse_args()
+    
+    if args.profile:
+        profiler.start(args.profile_interval / 1000)
+    with profiler.section("startup"):
+        cli = AgentCLI()
+    try:
+        cli.run()
+    finally:
+        output_dir = profiler.stop()
+        if output_dir:
+            print(f"{Colors.DIM}Profile written to {output_dir}{Colors.RESET}\n")
+        job_table.shutdown()
+        if shell_pool:
+            shell_pool.close_all()
+        cli.mcp_pool.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from openagentcli.ui import Colors
+from openagentcli.protocol import ToolDefinition
+
+TOOL_NAME_SEPARATOR = "__"
+DEFAULT_CALL_TIMEOUT = 300.0
+# How long close() lets a session shut down cleanly before cancelling it
+CLOSE_TIMEOUT = 2.0
+
+
+class MCPServerConnection:
+    """Persistent client session to a single external stdio MCP server."""
+
+    def __init__(self, name: str, params: StdioServerParameters, lazy: bool = False, log_dir: Optional[Path] = None,
+                 call_timeout: float = DEFAULT_CALL_TIMEOUT):
+        self.name = name
+        self.params = params
+        self.lazy = lazy
+        self.call_timeout = call_timeout
+        self.log_dir = log_dir or Path.home() / ".openagentcli" / "logs"
+        self.session: Optional[ClientSession] = None
+        self.tools: list[dict] = []
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def cache_key(self) -> str:
+        """Stable key for the cached tool listing of this server."""
+        spec = json.dumps([self.params.command, self.params.args, self.params.env], sort_keys=True)
+        return f"{self.name}-{hashlib.sha256(spec.encode()).hexdigest()[:12]}"
+
+    async def connect(self):
+        """Spawn the server and open a session, unless one is already open."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.session is not None:
+                return
+            self._closing = asyncio.Event()
+            ready = asyncio.get_running_loop().create_future()
+            self._task = asyncio.create_task(self._run(ready))
+            try:
+                await ready
+            except BaseException:
+                # Startup failed or timed out (wait_for cancels us): stop the
+                # task too, which closes the transport and the server process
+                await self._cancel()
+                raise
+
+    async def _cancel(self):
+        task = self._task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self, ready: asyncio.Future):
+        # The transport and session contexts must be entered and exited by the
+        # same task, so a single task owns them for the lifetime of the session.
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        errlog = open(self.log_dir / f"mcp-{self.name}.log", "a")
+        try:
+            async with stdio_client(self.params, errlog=errlog) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    listing = await session.list_tools()
+                    self.tools = [
+                        {"name": t.name, "description": t.description or "", "inputSchema": t.inputSchema}
+                        for t in listing.tools
+                    ]
+                    self.session = session
+                    ready.set_result(None)
+                    await self._closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            self.session = None
+            errlog.close()
+            if not ready.done():
+                ready.set_exception(ConnectionError(f"MCP server '{self.name}' exited during startup"))
+
+    async def call_tool(self, tool_name: str, args: dict) -> Any:
+        await self.connect()
+        return await self.session.call_tool(tool_name, args)
+
+    async def close(self):
+        if self._closing is not None:
+            self._closing.set()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            await self._cancel()
+
+
+class MCPServerPool:
+    """Pool of persistent sessions to the external MCP servers listed in config.yaml.
+
+    Sessions live on a dedicated event loop thread so the synchronous CLI can
+    call into them without reconnecting per call. Tools are exposed as
+    `<server>__<tool>` to avoid clashing with the built-in tools.
+    """
+
+    def __init__(self, servers: list[dict], connect_timeout: float = 30.0):
+        self.connect_timeout = connect_timeout
+        self.cache_dir = Path.home() / ".openagentcli" / "mcp_tools"
+        self.connections: Dict[str, MCPServerConnection] = {}
+        for server in servers:
+            params = StdioServerParameters(
+                command=server["command"],
+                args=[str(a) for a in server.get("args", [])],
+                env={k: str(v) for k, v in server["env"].items()} if server.get("env") else None,
+                cwd=server.get("cwd"),
+            )
+            self.connections[server["name"]] = MCPServerConnection(
+                server["name"], params, server.get("lazy", False),
+                call_timeout=float(server.get("call_timeout", DEFAULT_CALL_TIMEOUT)),
+            )
+        self._routes: Dict[str, tuple[MCPServerConnection, str]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self, coro, timeout: Optional[float] = None):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-pool", daemon=True)
+            self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timed out or interrupted: don't leave the coroutine running on the loop
+            future.cancel()
+            raise
+
+    def _load_cached_tools(self, conn: MCPServerConnection) -> Optional[list[dict]]:
+        cache_file = self.cache_dir / f"{conn.cache_key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            return json.loads(cache_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _save_cached_tools(self, conn: MCPServerConnection):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / f"{conn.cache_key}.json").write_text(json.dumps(conn.tools))
+
+    async def _connect_all(self, conns: list[MCPServerConnection]) -> list:
+        async def connect(conn):
+            await asyncio.wait_for(conn.connect(), self.connect_timeout)
+        return await asyncio.gather(*(connect(c) for c in conns), return_exceptions=True)
+
+    def start(self) -> list[ToolDefinition]:
+        """Connect to all eager servers in parallel and return their namespaced tools.
+
+        Lazy servers with a cached tool listing are not spawned until one of
+        their tools is called.
+        """
+        if not self.connections:
+            return []
+
+        to_connect = []
+        for conn in self.connections.values():
+            cached = self._load_cached_tools(conn) if conn.lazy else None
+            if cached is None:
+                to_connect.append(conn)
+            else:
+                conn.tools = cached
+
+        if to_connect:
+            results = self._run(self._connect_all(to_connect))
+            for conn, result in zip(to_connect, results):
+                if isinstance(result, BaseException):
+                    reason = "timed out" if isinstance(result, asyncio.TimeoutError) else str(result) or type(result).__name__
+                    print(f"{Colors.WARNING}MCP server '{conn.name}' unavailable: {reason}{Colors.RESET}")
+                    conn.tools = []
+                else:
+                    self._save_cached_tools(conn)
+
+        tools = []
+        for conn in self.connections.values():
+            for tool in conn.tools:
+                qualified_name = f"{conn.name}{TOOL_NAME_SEPARATOR}{tool['name']}"
+                self._routes[qualified_name] = (conn, tool["name"])
+                tools.append(ToolDefinition(
+                    name=qualified_name,
+                    description=tool["description"],
+                    parameters=tool["inputSchema"] or {"type": "object", "properties": {}}
+                ))
+        return tools
+
+    def call_tool(self, qualified_name: str, args: dict) -> str:
+        """Route a namespaced tool call to the owning server's session."""
+        conn, tool_name = self._routes[qualified_name]
+
+        async def call():
+            # A lazy server is spawned here; bound its startup like the eager ones
+            await asyncio.wait_for(conn.connect(), self.connect_timeout)
+            return await asyncio.wait_for(conn.session.call_tool(tool_name, args), conn.call_timeout)
+
+        try:
+            result = self._run(call())
+        except (asyncio.TimeoutError, TimeoutError):
+            raise TimeoutError(f"MCP server '{conn.name}' did not answer {tool_name} in time") from None
+
+        parts = []
+        for item in result.content:
+            text = getattr(item, "text", None)
+            parts.append(text if text is not None else f"[{item.type} content]")
+        output = "\n".join(parts)
+        if result.isError:
+            raise RuntimeError(output or f"{qualified_name} failed")
+        return output
+
+    def functions_map(self) -> Dict[str, Callable]:
+        """Callables for ToolExecutor, one per namespaced external tool."""
+        def make_caller(qualified_name: str) -> Callable:
+            return lambda **args: self.call_tool(qualified_name, args)
+        return {name: make_caller(name) for name in self._routes}
+
+    def close(self):
+        """Shut down all open sessions and the pool's event loop."""
+        if self._loop is None:
+            return
+
+        async def close_all():
+            await asyncio.gather(*(c.close() for c in self.connections.values()), return_exceptions=True)
+
+        try:
+            self._run(close_all(), timeout=5)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
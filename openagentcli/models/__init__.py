@@ -2,5 +2,6 @@
 
 from .base import BaseModel
 from .cohere_model import CohereModel
+from .openai_model import OpenAIModel
 
-__all__ = ["BaseModel", "CohereModel"]
+__all__ = ["BaseModel", "CohereModel", "OpenAIModel"]
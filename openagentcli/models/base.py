@@ -1,10 +1,61 @@
 from abc import ABC, abstractmethod
-from openagentcli.protocol import Message, ToolDefinition, ProtocolAdapter
+from typing import Iterator
+from openagentcli.protocol import Message, ToolDefinition, ProtocolAdapter, StreamEvent
+
+SYSTEM_PROMPT = """You are a coding assistant that helps users with software development tasks. Your name is OpenAgentCLI.
+
+<tool_usage>
+- Chain multiple tool calls together when they have no dependencies - execute them in parallel
+- If a tool call fails, analyze the error and attempt to fix it automatically when reasonable
+- Read files before modifying them to understand context
+- STRONGLY PREFER chaining multiple replace_exact_in_file calls over using overwrite_file
+- Use replace_exact_in_file for surgical edits - it's safer, preserves context, and shows clear intent
+- Only use overwrite_file when completely rewriting a file or when the number of changes would be excessive
+- Execute bash commands to test changes and verify functionality
+- Search files to understand project structure before making changes
+</tool_usage>
+
+<error_recovery>
+When a tool call fails:
+- Parse the error message to understand what went wrong
+- For file operations: check if the file exists, verify paths, ensure proper formatting
+- For bash commands: check syntax, verify dependencies, try alternative approaches
+- For replace_exact_in_file: ensure old_str exists exactly as specified, check for whitespace issues
+- Attempt automatic fixes for common issues (missing directories, incorrect paths, syntax errors)
+- Only ask the user for help if the error is ambiguous or requires external information
+</error_recovery>
+
+<code_quality>
+- Write clean, readable code with appropriate comments
+- Follow language-specific best practices and conventions
+- Explain reasoning for non-obvious implementation decisions
+- Break complex tasks into manageable steps
+- Prioritize maintainability and clarity over cleverness
+</code_quality>
+
+<response_style>
+- Be concise and direct - focus on practical solutions
+- Avoid unnecessary pleasantries or confirmations
+- Show your work when debugging or problem-solving
+- Provide context for decisions when helpful
+</response_style>"""
 
 class BaseModel(ABC):
     def __init__(self, adapter: ProtocolAdapter, custom_instructions: str = None):
         self.adapter = adapter
         self.custom_instructions = custom_instructions
+        self.system_prompt = SYSTEM_PROMPT
+        if self.custom_instructions:
+            self.system_prompt += f"\n\n<custom_instructions>\n{self.custom_instructions}\n</custom_instructions>"
+    
+    def estimate_tokens(self, messages: list[Message], tools: list[ToolDefinition]) -> int:
+        """Rough prompt size in tokens (~4 characters per token) for rate limiting."""
+        chars = len(self.system_prompt)
+        for msg in messages:
+            chars += msg.size
+        for tool in tools:
+            chars += len(tool.name) + len(tool.description) + len(str(tool.parameters))
+        return chars // 4
     
     @abstractmethod
     def chat(self, messages: list[Message], tools: list[ToolDefinition]) -> Message:
@@ -13,3 +64,10 @@ class BaseModel(ABC):
     @abstractmethod
     def chat_stream(self, messages: list[Message], tools: list[ToolDefinition]) -> Message:
         pass
+    
+    def stream_events(self, messages: list[Message], tools: list[ToolDefinition]) -> Iterator[StreamEvent]:
+        """Yield tool calls as soon as they are complete, then the full response.
+        
+        Models that cannot parse their stream incrementally only yield the final message.
+        """
+        yield StreamEvent(message=self.chat(messages, tools))
@@ -1,68 +1,89 @@
 import os
+import itertools
+from contextlib import closing
+from typing import Iterator
 from cohere import ClientV2
+from cohere.errors import TooManyRequestsError
 from .base import BaseModel
-from openagentcli.protocol import Message, ToolDefinition, CohereAdapter
+from .scheduler import get_scheduler, RateLimitError
+from openagentcli.protocol import Message, ToolDefinition, CohereAdapter, StreamEvent
 from dotenv import load_dotenv
 
 class CohereModel(BaseModel):
-    def __init__(self, custom_instructions: str = None):
+    def __init__(self, custom_instructions: str = None, model: str = "command-a-03-2025"):
         super().__init__(CohereAdapter(), custom_instructions)
         load_dotenv()
         api_key = os.getenv("COHERE_API_KEY")
         if not api_key:
             raise ValueError("COHERE_API_KEY not set")
         self.client = ClientV2(api_key=api_key)
-        self.model = "command-a-03-2025"
-        self.system_prompt = """You are a coding assistant that helps users with software development tasks. Your name is OpenAgentCLI.
-
-<tool_usage>
-- Chain multiple tool calls together when they have no dependencies - execute them in parallel
-- If a tool call fails, analyze the error and attempt to fix it automatically when reasonable
-- Read files before modifying them to understand context
-- STRONGLY PREFER chaining multiple replace_exact_in_file calls over using overwrite_file
-- Use replace_exact_in_file for surgical edits - it's safer, preserves context, and shows clear intent
-- Only use overwrite_file when completely rewriting a file or when the number of changes would be excessive
-- Execute bash commands to test changes and verify functionality
-- Search files to understand project structure before making changes
-</tool_usage>
-
-<error_recovery>
-When a tool call fails:
-- Parse the error message to understand what went wrong
-- For file operations: check if the file exists, verify paths, ensure proper formatting
-- For bash commands: check syntax, verify dependencies, try alternative approaches
-- For replace_exact_in_file: ensure old_str exists exactly as specified, check for whitespace issues
-- Attempt automatic fixes for common issues (missing directories, incorrect paths, syntax errors)
-- Only ask the user for help if the error is ambiguous or requires external information
-</error_recovery>
-
-<code_quality>
-- Write clean, readable code with appropriate comments
-- Follow language-specific best practices and conventions
-- Explain reasoning for non-obvious implementation decisions
-- Break complex tasks into manageable steps
-- Prioritize maintainability and clarity over cleverness
-</code_quality>
-
-<response_style>
-- Be concise and direct - focus on practical solutions
-- Avoid unnecessary pleasantries or confirmations
-- Show your work when debugging or problem-solving
-- Provide context for decisions when helpful
-</response_style>"""
-        
-        if self.custom_instructions:
-            self.system_prompt += f"\n\n<custom_instructions>\n{self.custom_instructions}\n</custom_instructions>"
+        self.model = model
+    
+    def _retry_after(self, error: TooManyRequestsError):
+        try:
+            return float((error.headers or {}).get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+    
+    def _record_usage(self, ticket, usage):
+        tokens = usage.tokens if usage else None
+        if tokens and tokens.input_tokens is not None:
+            ticket.record_usage(int(tokens.input_tokens + (tokens.output_tokens or 0)))
     
     def chat(self, messages: list[Message], tools: list[ToolDefinition]) -> Message:
         provider_messages = self.adapter.to_provider_messages(messages)
-        provider_tools = self.adapter.to_provider_tools(tools)
+        # Tool-less requests (e.g. history summaries) omit the field entirely
+        provider_tools = {"tools": self.adapter.to_provider_tools(tools)} if tools else {}
         messages_with_system = [{"role": "system", "content": self.system_prompt}] + provider_messages
-        response = self.client.chat(model=self.model, messages=messages_with_system, tools=provider_tools)
+        
+        def request(ticket):
+            try:
+                response = self.client.chat(model=self.model, messages=messages_with_system, **provider_tools)
+            except TooManyRequestsError as e:
+                raise RateLimitError(str(e), self._retry_after(e))
+            self._record_usage(ticket, response.usage)
+            return response
+        
+        response = get_scheduler().run(self.model, self.estimate_tokens(messages, tools), request)
         return self.adapter.from_provider_response(response)
     
-    def chat_stream(self, messages: list[Message], tools: list[ToolDefinition]) -> Message:
+    def chat_stream(self, messages: list[Message], tools: list[ToolDefinition]):
         provider_messages = self.adapter.to_provider_messages(messages)
-        provider_tools = self.adapter.to_provider_tools(tools)
+        # Tool-less requests (e.g. history summaries) omit the field entirely
+        provider_tools = {"tools": self.adapter.to_provider_tools(tools)} if tools else {}
         messages_with_system = [{"role": "system", "content": self.system_prompt}] + provider_messages
-        return self.client.chat_stream(model=self.model, messages=messages_with_system, tools=provider_tools)
+        with get_scheduler().slot(self.model, self.estimate_tokens(messages, tools)) as ticket:
+            try:
+                # closing(): a consumer that stops early also closes the HTTP response
+                with closing(self.client.chat_stream(model=self.model, messages=messages_with_system, **provider_tools)) as events:
+                    for event in events:
+                        if getattr(event, "type", None) == "message-end" and event.delta:
+                            # Usage only arrives with the last event of the stream
+                            self._record_usage(ticket, event.delta.usage)
+                        yield event
+            except TooManyRequestsError as e:
+                raise RateLimitError(str(e), self._retry_after(e))
+    
+    def stream_events(self, messages: list[Message], tools: list[ToolDefinition]) -> Iterator[StreamEvent]:
+        scheduler = get_scheduler()
+        for attempt in itertools.count():
+            stream = self.chat_stream(messages, tools)
+            try:
+                # A 429 surfaces when the stream is opened, before any event
+                first = next(stream, None)
+            except RateLimitError as e:
+                if attempt >= scheduler.max_retries:
+                    raise
+                scheduler.on_rate_limited(e.retry_after, attempt)
+                continue
+            break
+        
+        parser = self.adapter.stream_parser()
+        for event in itertools.chain([first] if first is not None else [], stream):
+            tool_call = parser.feed(event)
+            if tool_call:
+                # The consumer may run the tool before asking for the next event
+                with scheduler.released(self.model):
+                    yield StreamEvent(tool_call=tool_call, tool_plan=parser.tool_plan)
+        scheduler.on_success()
+        yield StreamEvent(message=parser.message())
@@ -0,0 +1,144 @@
+import os
+import json
+import threading
+import http.client
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+from .base import BaseModel
+from .scheduler import get_scheduler, RateLimitError
+from openagentcli.protocol import Message, ToolDefinition, OpenAIAdapter
+from dotenv import load_dotenv
+
+# Errors that mean a pooled keep-alive connection was closed by the server
+# before our request was answered; the request is safe to retry once.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+class ConnectionPool:
+    """Small pool of keep-alive HTTP connections to a single host."""
+
+    def __init__(self, base_url: str, timeout: float, max_idle: int = 4):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Return a connection and whether it was reused from the pool."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout), False
+
+    def release(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+class OpenAIModel(BaseModel):
+    """Model served through an OpenAI-compatible chat-completions API (llama.cpp, vLLM, ...)."""
+
+    def __init__(self, custom_instructions: str = None, base_url: str = "http://localhost:8080/v1",
+                 model: str = "local", api_key: Optional[str] = None, stream: bool = True,
+                 timeout: float = 600, max_connections: int = 4):
+        super().__init__(OpenAIAdapter(), custom_instructions)
+        load_dotenv()
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.model = model
+        self.stream = stream
+        self.pool = ConnectionPool(base_url, timeout, max_connections)
+
+    def _build_body(self, messages: list[Message], tools: list[ToolDefinition], stream: bool) -> bytes:
+        provider_messages = self.adapter.to_provider_messages(messages)
+        body = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": self.system_prompt}] + provider_messages,
+            "stream": stream
+        }
+        if tools:
+            body["tools"] = self.adapter.to_provider_tools(tools)
+        return json.dumps(body).encode()
+
+    def _post(self, body: bytes) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        conn, reused = self.pool.acquire()
+        try:
+            conn.request("POST", f"{self.pool.path}/chat/completions", body=body, headers=headers)
+            response = conn.getresponse()
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            conn, _ = self.pool.acquire()
+            conn.request("POST", f"{self.pool.path}/chat/completions", body=body, headers=headers)
+            response = conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+
+        if response.status >= 400:
+            detail = response.read().decode(errors="replace")
+            self.pool.release(conn)
+            if response.status == 429:
+                retry_after = response.getheader("Retry-After")
+                raise RateLimitError(detail, float(retry_after) if retry_after and retry_after.isdigit() else None)
+            raise RuntimeError(f"HTTP {response.status} from {self.pool.host}: {detail}")
+        return conn, response
+
+    def _iter_chunks(self, body: bytes) -> Iterator[dict]:
+        conn, response = self._post(body)
+        finished = False
+        try:
+            for raw in response:
+                line = raw.decode().strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                yield json.loads(data)
+            # Drain whatever is left so the connection can be reused
+            response.read()
+            finished = True
+        finally:
+            if finished:
+                self.pool.release(conn)
+            else:
+                conn.close()
+
+    def chat(self, messages: list[Message], tools: list[ToolDefinition]) -> Message:
+        def request(ticket):
+            if self.stream:
+                return self.adapter.from_provider_stream(self._iter_chunks(self._build_body(messages, tools, stream=True)))
+            conn, response = self._post(self._build_body(messages, tools, stream=False))
+            try:
+                data = json.loads(response.read())
+            except Exception:
+                conn.close()
+                raise
+            self.pool.release(conn)
+            if data.get("usage", {}).get("total_tokens") is not None:
+                ticket.record_usage(data["usage"]["total_tokens"])
+            return self.adapter.from_provider_response(data)
+        
+        return get_scheduler().run(self.model, self.estimate_tokens(messages, tools), request)
+
+    def chat_stream(self, messages: list[Message], tools: list[ToolDefinition]) -> Iterator[dict]:
+        with get_scheduler().slot(self.model, self.estimate_tokens(messages, tools)):
+            yield from self._iter_chunks(self._build_body(messages, tools, stream=True))
@@ -0,0 +1,179 @@
+import time
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Optional
+from .base import BaseModel
+from .scheduler import current_priority, request_priority, get_scheduler, RateLimitError
+from openagentcli.protocol import Message, ToolDefinition, Role
+
+class LatencyTracker:
+    """Rolling window of call latencies for one backend."""
+
+    def __init__(self, window: int = 200):
+        self.samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class HedgeCancelled(Exception):
+    """Raised inside a hedged call that lost to the other request."""
+
+class RouterModel(BaseModel):
+    """Routes each request to one of several configured backends.
+
+    Turns that follow tool results go to the `tool_turn` backend (usually a fast,
+    cheap model); turns that start from a user message go to `user_turn`. If a
+    non-`final` backend answers without calling tools, the answer is regenerated
+    by the `final` backend. With hedging enabled, a second request is fired when
+    the first has not returned after the backend's observed p95 latency, and the
+    first response wins.
+    """
+
+    TURN_KINDS = ("user_turn", "tool_turn", "final")
+
+    def __init__(self, custom_instructions: str = None, backends: dict = None, rules: dict = None,
+                 hedge: dict = None):
+        from openagentcli.config import build_model
+
+        if not backends:
+            raise ValueError("RouterModel needs at least one entry under 'backends'")
+        self.backends: dict[str, BaseModel] = {
+            name: build_model(backend_config, custom_instructions)
+            for name, backend_config in backends.items()
+        }
+
+        default = next(iter(self.backends))
+        rules = rules or {}
+        self.rules = {kind: rules.get(kind, rules.get("final", default)) for kind in self.TURN_KINDS}
+        for kind, name in self.rules.items():
+            if name not in self.backends:
+                raise ValueError(f"Rule '{kind}' refers to unknown backend '{name}'")
+        self.escalate_final = rules.get("escalate_final", True)
+
+        super().__init__(self.backends[self.rules["final"]].adapter, custom_instructions)
+
+        hedge = hedge or {}
+        self.hedge_enabled = hedge.get("enabled", False)
+        self.hedge_quantile = hedge.get("quantile", 0.95)
+        self.hedge_min_samples = hedge.get("min_samples", 20)
+        self.hedge_min_delay = hedge.get("min_delay", 1.0)
+        self.hedge_initial_delay = hedge.get("initial_delay", 15.0)
+        self.hedge_backend = hedge.get("backend")
+        if self.hedge_backend and self.hedge_backend not in self.backends:
+            raise ValueError(f"Hedge backend '{self.hedge_backend}' is not a configured backend")
+
+        self.latency = {name: LatencyTracker() for name in self.backends}
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="router")
+
+    def route(self, messages: list[Message]) -> str:
+        """Name of the backend that should serve the next request."""
+        if messages and messages[-1].role == Role.TOOL:
+            return self.rules["tool_turn"]
+        return self.rules["user_turn"]
+
+    def _hedge_delay(self, name: str) -> float:
+        tracker = self.latency[name]
+        if len(tracker.samples) < self.hedge_min_samples:
+            return self.hedge_initial_delay
+        return max(self.hedge_min_delay, tracker.percentile(self.hedge_quantile))
+
+    def _stream_chat(self, name: str, messages: list[Message], tools: list[ToolDefinition],
+                     cancel: threading.Event) -> Message:
+        """chat() read chunk by chunk from the backend's stream, abandoned once `cancel` is set.
+
+        Closing the stream closes the HTTP response and gives back the
+        scheduler slot, so a losing hedge stops costing anything.
+        """
+        backend = self.backends[name]
+        parse = getattr(backend.adapter, "from_provider_stream", None)
+        if parse is None or not getattr(backend, "stream", True):
+            # Cannot be interrupted mid-request; a losing result is dropped
+            return backend.chat(messages, tools)
+
+        scheduler = get_scheduler()
+        for attempt in itertools.count():
+            stream = backend.chat_stream(messages, tools)
+
+            def chunks():
+                for chunk in stream:
+                    if cancel.is_set():
+                        raise HedgeCancelled(name)
+                    yield chunk
+            try:
+                response = parse(chunks())
+            except RateLimitError as e:
+                if attempt >= scheduler.max_retries or cancel.is_set():
+                    raise
+                scheduler.on_rate_limited(e.retry_after, attempt)
+                continue
+            finally:
+                stream.close()
+            scheduler.on_success()
+            return response
+
+    def _submit(self, name: str, messages: list[Message], tools: list[ToolDefinition],
+                cancel: threading.Event) -> Future:
+        start = time.monotonic()
+        # Priority is thread-local; carry the caller's into the executor thread
+        priority = current_priority()
+
+        def run() -> Message:
+            with request_priority(priority):
+                return self._stream_chat(name, messages, tools, cancel)
+        future = self.executor.submit(run)
+
+        def record(f: Future):
+            if not f.cancelled() and f.exception() is None:
+                self.latency[name].record(time.monotonic() - start)
+        future.add_done_callback(record)
+        return future
+
+    def _call(self, name: str, messages: list[Message], tools: list[ToolDefinition]) -> Message:
+        if not self.hedge_enabled:
+            start = time.monotonic()
+            response = self.backends[name].chat(messages, tools)
+            self.latency[name].record(time.monotonic() - start)
+            return response
+
+        cancel = threading.Event()
+        try:
+            primary = self._submit(name, messages, tools, cancel)
+            done, _ = wait([primary], timeout=self._hedge_delay(name))
+            if done:
+                return primary.result()
+
+            pending = {primary, self._submit(self.hedge_backend or name, messages, tools, cancel)}
+            error = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    error = future.exception()
+            raise error
+        finally:
+            # Stops the losing request at its next chunk (or before it starts),
+            # and both requests if the caller was interrupted
+            cancel.set()
+
+    def chat(self, messages: list[Message], tools: list[ToolDefinition]) -> Message:
+        name = self.route(messages)
+        response = self._call(name, messages, tools)
+        final = self.rules["final"]
+        if not response.tool_calls and name != final and self.escalate_final:
+            response = self._call(final, messages, tools)
+        return response
+
+    def chat_stream(self, messages: list[Message], tools: list[ToolDefinition]):
+        return self.backends[self.route(messages)].chat_stream(messages, tools)
@@ -0,0 +1,237 @@
+import time
+import itertools
+import threading
+from enum import IntEnum
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+class RateLimitError(Exception):
+    """Raised by a model when the provider rejects a request with HTTP 429."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+_local = threading.local()
+
+def current_priority() -> Priority:
+    return getattr(_local, "priority", Priority.INTERACTIVE)
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Run model requests made by this thread at the given priority."""
+    previous = current_priority()
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute` units per minute."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float, scale: float):
+        rate = self.per_minute * scale / 60
+        self.level = min(self.capacity, self.level + (now - self.updated) * rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, scale: float = 1.0) -> float:
+        """Seconds until `amount` (capped at capacity) is available."""
+        now = time.monotonic()
+        self._refill(now, scale)
+        needed = min(amount, self.capacity) - self.level
+        return 0.0 if needed <= 0 else needed / (self.per_minute * scale / 60)
+
+    def consume(self, amount: float):
+        self.level -= amount
+
+class Ticket:
+    def __init__(self, seq: int, model: str, priority: Priority, tokens: int):
+        self.seq = seq
+        self.model = model
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.used_tokens: Optional[int] = None
+
+    def record_usage(self, tokens: int):
+        """Report the tokens actually used so the token bucket can be corrected."""
+        self.used_tokens = tokens
+
+class RequestScheduler:
+    """Shared client-side scheduler for model API requests.
+
+    Requests wait in a priority queue (interactive before background, FIFO
+    within a priority) until a global and per-model concurrency slot is free and
+    the requests/min and tokens/min buckets allow them. A 429 halves the
+    effective rate and pauses dispatch for the provider's Retry-After;
+    successful requests restore the rate gradually.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_concurrency: int = 8, per_model_concurrency: Optional[dict] = None, max_retries: int = 3):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.per_model_concurrency = per_model_concurrency or {}
+        self.max_retries = max_retries
+        self.rate_scale = 1.0
+        self.blocked_until = 0.0
+        self.waiting: list[Ticket] = []
+        self.active: Counter = Counter()
+        self.total_active = 0
+        self.cond = threading.Condition()
+        self._seq = itertools.count()
+        self.wait_times = {p: deque(maxlen=1000) for p in Priority}
+        self.completed = 0
+        self.rate_limited = 0
+
+    def _model_cap(self, model: str) -> int:
+        return self.per_model_concurrency.get(model, self.max_concurrency)
+
+    def _next_ticket(self) -> Optional[Ticket]:
+        """Highest-priority waiting ticket whose model has a free slot."""
+        for ticket in sorted(self.waiting, key=lambda t: (t.priority, t.seq)):
+            if self.active[ticket.model] < self._model_cap(ticket.model):
+                return ticket
+        return None
+
+    def _delay(self, ticket: Ticket) -> float:
+        delay = self.blocked_until - time.monotonic()
+        if self.requests:
+            delay = max(delay, self.requests.wait_time(1, self.rate_scale))
+        if self.tokens:
+            delay = max(delay, self.tokens.wait_time(ticket.tokens, self.rate_scale))
+        return delay
+
+    @contextmanager
+    def slot(self, model: str, tokens: int = 0) -> Iterator[Ticket]:
+        """Wait for permission to send one request; held until the response is read."""
+        ticket = Ticket(next(self._seq), model, current_priority(), tokens)
+        with self.cond:
+            self.waiting.append(ticket)
+            try:
+                while True:
+                    if self._next_ticket() is ticket and self.total_active < self.max_concurrency:
+                        delay = self._delay(ticket)
+                        if delay <= 0:
+                            break
+                        self.cond.wait(delay)
+                    else:
+                        self.cond.wait()
+            except BaseException:
+                # e.g. Ctrl+C during a 429 pause: a stale ticket would block every later request
+                self.waiting.remove(ticket)
+                self.cond.notify_all()
+                raise
+            self.waiting.remove(ticket)
+            if self.requests:
+                self.requests.consume(1)
+            if self.tokens:
+                self.tokens.consume(tokens)
+            self.active[model] += 1
+            self.total_active += 1
+            self.wait_times[ticket.priority].append(time.monotonic() - ticket.enqueued)
+            self.cond.notify_all()
+        try:
+            yield ticket
+        finally:
+            with self.cond:
+                self.active[model] -= 1
+                self.total_active -= 1
+                if self.tokens and ticket.used_tokens is not None:
+                    self.tokens.consume(ticket.used_tokens - tokens)
+                self.cond.notify_all()
+
+    @contextmanager
+    def released(self, model: str):
+        """Give back a held slot of `model` for the duration of the block, then take it back.
+
+        Used while the consumer of a suspended response stream runs tools, so a
+        long tool call does not occupy the model's concurrency. Taking the slot
+        back only waits for the concurrency caps, not the queue or rate buckets:
+        the request has already been sent.
+        """
+        with self.cond:
+            self.active[model] -= 1
+            self.total_active -= 1
+            self.cond.notify_all()
+        resumed = False
+        try:
+            yield
+            resumed = True
+        finally:
+            with self.cond:
+                # On an error the stream is being closed and its slot released right after
+                while resumed and (self.active[model] >= self._model_cap(model) or self.total_active >= self.max_concurrency):
+                    self.cond.wait()
+                self.active[model] += 1
+                self.total_active += 1
+
+    def on_rate_limited(self, retry_after: Optional[float], attempt: int):
+        """Back off after a 429: halve the rate and pause dispatch."""
+        with self.cond:
+            self.rate_limited += 1
+            self.rate_scale = max(0.1, self.rate_scale / 2)
+            pause = retry_after if retry_after is not None else min(60.0, 2.0 ** attempt)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            self.cond.notify_all()
+
+    def on_success(self):
+        with self.cond:
+            self.completed += 1
+            self.rate_scale = min(1.0, self.rate_scale + 0.05)
+
+    def run(self, model: str, tokens: int, request: Callable[[Ticket], T]) -> T:
+        """Send request(ticket) through the scheduler, retrying on RateLimitError."""
+        for attempt in itertools.count():
+            try:
+                with self.slot(model, tokens) as ticket:
+                    result = request(ticket)
+            except RateLimitError as e:
+                if attempt >= self.max_retries:
+                    raise
+                self.on_rate_limited(e.retry_after, attempt)
+                continue
+            self.on_success()
+            return result
+
+    def stats(self) -> dict:
+        def percentile(samples, q):
+            ordered = sorted(samples)
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+        with self.cond:
+            return {
+                "completed": self.completed,
+                "rate_limited": self.rate_limited,
+                "rate_scale": self.rate_scale,
+                "queued": len(self.waiting),
+                "wait": {
+                    p.name.lower(): {"count": len(s), "p50": percentile(s, 0.5), "p95": percentile(s, 0.95)}
+                    for p, s in self.wait_times.items()
+                },
+            }
+
+_scheduler = RequestScheduler()
+
+def configure_scheduler(rate_limits: Optional[dict]):
+    """Replace the shared scheduler with one built from the `rate_limits` config block."""
+    global _scheduler
+    _scheduler = RequestScheduler(**(rate_limits or {}))
+
+def get_scheduler() -> RequestScheduler:
+    return _scheduler
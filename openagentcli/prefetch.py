@@ -0,0 +1,70 @@
+import os
+import re
+import json
+import threading
+from typing import Optional
+from openagentcli.protocol import Message, Role
+from openagentcli.server.read_cache import ReadCache, read_cache
+
+# Path-like tokens: anything containing a '/' or ending in a short extension
+PATH_TOKEN = re.compile(r"[\w.~/-]+")
+
+class Prefetcher:
+    """Warms the read cache with files mentioned in recent messages.
+
+    Runs in the background while the model call is in flight, so that a
+    following read_file on one of those paths is served from memory.
+    """
+
+    def __init__(self, cache: ReadCache = read_cache, lookback: int = 6, max_candidates: int = 32):
+        self.cache = cache
+        self.lookback = lookback
+        self.max_candidates = max_candidates
+        self.thread: Optional[threading.Thread] = None
+
+    def _texts(self, messages: list[Message]) -> list[str]:
+        texts = []
+        for msg in messages[-self.lookback:]:
+            if msg.role not in (Role.USER, Role.TOOL) or not msg.content:
+                continue
+            if msg.role == Role.TOOL:
+                # Tool results are JSON-encoded; decode so escaped newlines don't glue paths together
+                try:
+                    decoded = json.loads(msg.content)
+                except ValueError:
+                    decoded = msg.content
+                if isinstance(decoded, dict):
+                    texts.extend(v for v in decoded.values() if isinstance(v, str))
+                elif isinstance(decoded, str):
+                    texts.append(decoded)
+            else:
+                texts.append(msg.content)
+        return texts
+
+    def candidates(self, messages: list[Message]) -> list[str]:
+        """Existing files referenced in the most recent messages, newest first."""
+        seen = set()
+        paths = []
+        for text in reversed(self._texts(messages)):
+            for token in PATH_TOKEN.findall(text):
+                token = token.rstrip(".")
+                if token in seen or ("/" not in token and "." not in token.lstrip(".")):
+                    continue
+                seen.add(token)
+                path = os.path.expanduser(token)
+                if os.path.isfile(path):
+                    paths.append(path)
+                    if len(paths) >= self.max_candidates:
+                        return paths
+        return paths
+
+    def _warm(self, messages: list[Message]):
+        for path in self.candidates(messages):
+            self.cache.warm(path)
+
+    def start(self, messages: list[Message]):
+        """Start warming candidates from messages, unless a previous run is still going."""
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._warm, args=(list(messages),), name="prefetch", daemon=True)
+        self.thread.start()
@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+MAX_DEPTH = 128
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for the CLI's main thread.
+
+    A daemon thread reads the main thread's stack through
+    sys._current_frames() every `interval` seconds. Samples are only kept
+    while a section (a turn, a tool call) is active, and every stack is
+    prefixed with the active sections so one collapsed-stack file can be
+    split by turn or tool in a flamegraph viewer.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.enabled = False
+        self.stacks: Counter = Counter()
+        self.sections: list[str] = []
+        self.section_samples: Counter = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.sampler_cpu = 0.0
+        self.started = 0.0
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.main_ident = threading.main_thread().ident
+        self.output_dir: Optional[Path] = None
+        self._names: dict = {}
+
+    def start(self, interval: Optional[float] = None):
+        if interval:
+            self.interval = interval
+        self.enabled = True
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.output_dir = Path.home() / ".openagentcli" / "profiles" / f"{stamp}-{os.getpid()}"
+        self.thread = threading.Thread(target=self._loop, name="profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> Optional[Path]:
+        """Stop sampling and write the collapsed stacks; returns their directory."""
+        if not self.enabled:
+            return None
+        self.stop_event.set()
+        self.thread.join()
+        self.enabled = False
+        return self.write()
+
+    @contextmanager
+    def section(self, label: str):
+        """Attribute samples taken inside this block to `label` (main thread only)."""
+        if not self.enabled or threading.get_ident() != self.main_ident:
+            yield
+            return
+        self.sections.append(label.replace(";", ","))
+        try:
+            yield
+        finally:
+            self.sections.pop()
+
+    def _frame_name(self, code) -> str:
+        name = self._names.get(code)
+        if name is None:
+            name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+            self._names[code] = name
+        return name
+
+    def _loop(self):
+        start_cpu = time.thread_time()
+        last = self.started = time.perf_counter()
+        while not self.stop_event.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            sections = tuple(self.sections)
+            if not sections:
+                continue
+            frame = sys._current_frames().get(self.main_ident)
+            names = []
+            while frame is not None and len(names) < MAX_DEPTH:
+                names.append(self._frame_name(frame.f_code))
+                frame = frame.f_back
+            names.reverse()
+            stack = ";".join(sections + tuple(names))
+            with self.lock:
+                self.stacks[stack] += 1
+                self.samples += 1
+                self.sampling_seconds += elapsed
+                for section in sections:
+                    self.section_samples[section] += 1
+            self.sampler_cpu = time.thread_time() - start_cpu
+
+    @property
+    def seconds_per_sample(self) -> float:
+        return self.sampling_seconds / self.samples if self.samples else self.interval
+
+    def summary(self, top_n: int = 15) -> dict:
+        """Hot functions by self and total time, and time per section."""
+        with self.lock:
+            stacks = dict(self.stacks)
+            section_samples = dict(self.section_samples)
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            functions = [f for f in frames if f not in section_samples]
+            if functions:
+                own[functions[-1]] += count
+            for function in set(functions):
+                total[function] += count
+        per_sample = self.seconds_per_sample
+        wall = time.perf_counter() - self.started if self.started else 0.0
+        return {
+            "samples": sum(stacks.values()),
+            "seconds_per_sample": per_sample,
+            "own": [(f, c * per_sample) for f, c in own.most_common(top_n)],
+            "total": [(f, c * per_sample) for f, c in total.most_common(top_n)],
+            "sections": {s: c * per_sample for s, c in section_samples.items()},
+            "overhead": self.sampler_cpu / wall if wall else 0.0,
+            "output_dir": self.output_dir,
+        }
+
+    def write(self) -> Optional[Path]:
+        """Write collapsed stacks: all samples, and one file per tool."""
+        with self.lock:
+            stacks = dict(self.stacks)
+        if not stacks or self.output_dir is None:
+            return None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        per_tool: dict[str, Counter] = {}
+        lines = []
+        for stack, count in sorted(stacks.items()):
+            lines.append(f"{stack} {count}\n")
+            frames = stack.split(";")
+            for i, frame in enumerate(frames):
+                if frame.startswith("tool "):
+                    rest = [f for f in frames[i + 1:] if f not in self.section_samples]
+                    per_tool.setdefault(frame[5:], Counter())[";".join(rest)] += count
+                    break
+        (self.output_dir / "all.collapsed").write_text("".join(lines))
+        for tool, tool_stacks in per_tool.items():
+            safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in tool)
+            (self.output_dir / f"tool-{safe}.collapsed").write_text(
+                "".join(f"{stack} {count}\n" for stack, count in sorted(tool_stacks.items()) if stack))
+        return self.output_dir
+
+profiler = SamplingProfiler()
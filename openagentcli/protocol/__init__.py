@@ -1,5 +1,8 @@
 from .types import Message, ToolCall, ToolDefinition, Role
+from .streaming import StreamEvent, JsonAccumulator
 from .adapter import ProtocolAdapter
-from .cohere_adapter import CohereAdapter
+from .cohere_adapter import CohereAdapter, CohereStreamParser
+from .openai_adapter import OpenAIAdapter
 
-__all__ = ["Message", "ToolCall", "ToolDefinition", "Role", "ProtocolAdapter", "CohereAdapter"]
+__all__ = ["Message", "ToolCall", "ToolDefinition", "Role", "StreamEvent", "JsonAccumulator", "ProtocolAdapter",
+           "CohereAdapter", "CohereStreamParser", "OpenAIAdapter"]
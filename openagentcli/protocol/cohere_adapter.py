@@ -1,7 +1,70 @@
 import json
-from typing import Any
+from typing import Any, Iterable, Optional
 from .adapter import ProtocolAdapter
 from .types import Message, ToolCall, ToolDefinition, Role
+from .streaming import JsonAccumulator
+
+class CohereStreamParser:
+    """Incrementally parses Cohere v2 chat stream events.
+
+    feed() returns each tool call as soon as its arguments are complete;
+    message() builds the full response once the stream has ended.
+    """
+
+    def __init__(self):
+        self.content: list[str] = []
+        self.plan: list[str] = []
+        self.calls: dict[int, dict] = {}
+        self.emitted: set[int] = set()
+
+    @property
+    def tool_plan(self) -> Optional[str]:
+        return "".join(self.plan) or None
+
+    def _finish(self, index: int) -> Optional[ToolCall]:
+        call = self.calls.get(index)
+        if call is None or index in self.emitted:
+            return None
+        self.emitted.add(index)
+        call["tool_call"] = ToolCall(id=call["id"], name=call["name"], arguments=call["arguments"].value())
+        return call["tool_call"]
+
+    def feed(self, event: Any) -> Optional[ToolCall]:
+        kind = getattr(event, "type", None)
+        if kind == "content-delta":
+            self.content.append(event.delta.message.content.text or "")
+        elif kind == "tool-plan-delta":
+            self.plan.append(event.delta.message.tool_plan or "")
+        elif kind == "tool-call-start":
+            tc = event.delta.message.tool_calls
+            arguments = JsonAccumulator()
+            self.calls[event.index] = {"id": tc.id, "name": tc.function.name, "arguments": arguments}
+            if tc.function.arguments:
+                arguments.feed(tc.function.arguments)
+        elif kind == "tool-call-delta":
+            call = self.calls.get(event.index)
+            fragment = event.delta.message.tool_calls.function.arguments
+            if call is not None and fragment:
+                call["arguments"].feed(fragment)
+        elif kind == "tool-call-end":
+            return self._finish(event.index)
+        else:
+            return None
+        call = self.calls.get(getattr(event, "index", None))
+        if call is not None and call["arguments"].complete:
+            return self._finish(event.index)
+        return None
+
+    def message(self) -> Message:
+        if self.calls:
+            for index in sorted(self.calls):
+                self._finish(index)
+            return Message(
+                role=Role.ASSISTANT,
+                tool_calls=[self.calls[index]["tool_call"] for index in sorted(self.calls)],
+                tool_plan=self.tool_plan
+            )
+        return Message(role=Role.ASSISTANT, content="".join(self.content) or None)
 
 class CohereAdapter(ProtocolAdapter):   
     def to_provider_messages(self, messages: list[Message]) -> list[dict]:
@@ -59,6 +122,16 @@ class CohereAdapter(ProtocolAdapter):
         content = msg.content[0].text if msg.content else None
         return Message(role=Role.ASSISTANT, content=content)
     
+    def stream_parser(self) -> CohereStreamParser:
+        return CohereStreamParser()
+    
+    def from_provider_stream(self, events: Iterable[Any]) -> Message:
+        """Accumulate streamed chat events into an internal message"""
+        parser = self.stream_parser()
+        for event in events:
+            parser.feed(event)
+        return parser.message()
+    
     def to_provider_tools(self, tools: list[ToolDefinition]) -> list[dict]:
         """Convert internal tools to Cohere format"""
         return [
@@ -0,0 +1,113 @@
+import json
+from typing import Any, Iterable
+from .adapter import ProtocolAdapter
+from .types import Message, ToolCall, ToolDefinition, Role
+
+class OpenAIAdapter(ProtocolAdapter):
+    def to_provider_messages(self, messages: list[Message]) -> list[dict]:
+        """Convert internal messages to OpenAI chat-completions format"""
+        openai_messages = []
+        for msg in messages:
+            if msg.role == Role.TOOL:
+                openai_messages.append({
+                    "role": self.role_to_provider(Role.TOOL),
+                    "tool_call_id": msg.tool_call_id,
+                    "content": msg.content
+                })
+            elif msg.role == Role.ASSISTANT and msg.tool_calls:
+                openai_messages.append({
+                    "role": self.role_to_provider(Role.ASSISTANT),
+                    "content": msg.tool_plan,
+                    "tool_calls": [
+                        {
+                            "id": tc.id,
+                            "type": "function",
+                            "function": {
+                                "name": tc.name,
+                                "arguments": json.dumps(tc.arguments)
+                            }
+                        }
+                        for tc in msg.tool_calls
+                    ]
+                })
+            else:
+                openai_messages.append({
+                    "role": self.role_to_provider(msg.role),
+                    "content": msg.content
+                })
+        return openai_messages
+    
+    def from_provider_response(self, response: Any) -> Message:
+        """Convert OpenAI chat-completions response to internal format"""
+        msg = response["choices"][0]["message"]
+        
+        if msg.get("tool_calls"):
+            tool_calls = [
+                ToolCall(
+                    id=tc["id"],
+                    name=tc["function"]["name"],
+                    arguments=json.loads(tc["function"].get("arguments") or "{}")
+                )
+                for tc in msg["tool_calls"]
+            ]
+            return Message(role=Role.ASSISTANT, tool_calls=tool_calls, tool_plan=msg.get("content") or None)
+        
+        return Message(role=Role.ASSISTANT, content=msg.get("content"))
+    
+    def from_provider_stream(self, chunks: Iterable[dict]) -> Message:
+        """Accumulate streamed chat-completions chunks into an internal message"""
+        content = []
+        tool_calls: dict[int, dict] = {}
+        for chunk in chunks:
+            if not chunk.get("choices"):
+                continue
+            delta = chunk["choices"][0].get("delta") or {}
+            if delta.get("content"):
+                content.append(delta["content"])
+            for tc in delta.get("tool_calls") or []:
+                call = tool_calls.setdefault(tc.get("index", 0), {"id": None, "name": "", "arguments": ""})
+                if tc.get("id"):
+                    call["id"] = tc["id"]
+                function = tc.get("function") or {}
+                if function.get("name"):
+                    call["name"] += function["name"]
+                if function.get("arguments"):
+                    call["arguments"] += function["arguments"]
+        
+        text = "".join(content) or None
+        if tool_calls:
+            return Message(
+                role=Role.ASSISTANT,
+                tool_calls=[
+                    ToolCall(
+                        id=call["id"] or f"call_{index}",
+                        name=call["name"],
+                        arguments=json.loads(call["arguments"] or "{}")
+                    )
+                    for index, call in sorted(tool_calls.items())
+                ],
+                tool_plan=text
+            )
+        return Message(role=Role.ASSISTANT, content=text)
+    
+    def to_provider_tools(self, tools: list[ToolDefinition]) -> list[dict]:
+        """Convert internal tools to OpenAI format"""
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": tool.parameters
+                }
+            }
+            for tool in tools
+        ]
+    
+    def to_tool_result(self, tool_call_id: str, result: dict) -> Message:
+        """Convert tool result to internal format"""
+        return Message(
+            role=Role.TOOL,
+            tool_call_id=tool_call_id,
+            content=json.dumps(result)
+        )
@@ -0,0 +1,51 @@
+import json
+from dataclasses import dataclass
+from typing import Optional
+from .types import Message, ToolCall
+
+@dataclass(slots=True)
+class StreamEvent:
+    """Something a model stream produced: a finished tool call, or the final message."""
+    tool_call: Optional[ToolCall] = None
+    tool_plan: Optional[str] = None
+    message: Optional[Message] = None
+
+class JsonAccumulator:
+    """Collects a JSON object streamed in fragments and tells when it is complete.
+
+    Tracks nesting depth outside of strings, so a tool call's arguments can be
+    parsed as soon as the closing brace arrives instead of at the end event.
+    """
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, fragment: str):
+        self.parts.append(fragment)
+        for ch in fragment:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+                self.started = True
+            elif ch in "}]":
+                self.depth -= 1
+
+    @property
+    def complete(self) -> bool:
+        return self.started and self.depth == 0
+
+    def value(self) -> dict:
+        text = "".join(self.parts).strip()
+        return json.loads(text) if text else {}
@@ -1,28 +1,87 @@
+import sys
+import zlib
 from dataclasses import dataclass
 from typing import Optional
 from enum import Enum
 
+# Content longer than this (in characters) is kept zlib-compressed in memory
+COMPRESS_THRESHOLD = 4096
+
 class Role(str, Enum):
     USER = "user"
     ASSISTANT = "assistant"
     TOOL = "tool"
     SYSTEM = "system"
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     id: str
     name: str
     arguments: dict
 
-@dataclass
+    def __post_init__(self):
+        self.id = sys.intern(self.id)
+        self.name = sys.intern(self.name)
+
 class Message:
-    role: Role
-    content: Optional[str] = None
-    tool_calls: Optional[list[ToolCall]] = None
-    tool_call_id: Optional[str] = None
-    tool_plan: Optional[str] = None
+    """A chat message in the internal format.
+
+    Slotted to avoid a per-instance __dict__. Large content is stored as
+    compressed bytes and only decoded when `content` is read, e.g. when an
+    adapter or ChatStorage serializes the message.
+    """
+
+    __slots__ = ("role", "_content", "tool_calls", "tool_call_id", "tool_plan", "_size")
+
+    def __init__(self, role: Role, content: Optional[str] = None, tool_calls: Optional[list[ToolCall]] = None,
+                 tool_call_id: Optional[str] = None, tool_plan: Optional[str] = None):
+        self.role = Role(role)
+        self.content = content
+        self.tool_calls = tool_calls
+        self.tool_call_id = sys.intern(tool_call_id) if tool_call_id is not None else None
+        self.tool_plan = tool_plan
+
+    @property
+    def content(self) -> Optional[str]:
+        if isinstance(self._content, bytes):
+            return zlib.decompress(self._content).decode()
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[str]):
+        self._size = None
+        if isinstance(value, str) and len(value) > COMPRESS_THRESHOLD:
+            compressed = zlib.compress(value.encode(), 1)
+            if len(compressed) < len(value):
+                self._content = compressed
+                return
+        self._content = value
+
+    @property
+    def size(self) -> int:
+        """Characters of content, tool plan and tool calls; computed once so compressed content is not re-read."""
+        if self._size is None:
+            size = len(self.content or "") + len(self.tool_plan or "")
+            for tc in self.tool_calls or []:
+                size += len(tc.name) + len(str(tc.arguments))
+            self._size = size
+        return self._size
+
+    @property
+    def compressed(self) -> bool:
+        return isinstance(self._content, bytes)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Message):
+            return NotImplemented
+        return (self.role, self.content, self.tool_calls, self.tool_call_id, self.tool_plan) == \
+            (other.role, other.content, other.tool_calls, other.tool_call_id, other.tool_plan)
+
+    def __repr__(self) -> str:
+        return (f"Message(role={self.role!r}, content={self.content!r}, tool_calls={self.tool_calls!r}, "
+                f"tool_call_id={self.tool_call_id!r}, tool_plan={self.tool_plan!r})")
 
-@dataclass
+@dataclass(slots=True)
 class ToolDefinition:
     name: str
     description: str
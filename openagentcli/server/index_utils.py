@@ -0,0 +1,28 @@
+import os
+import hashlib
+from pathlib import Path
+from typing import Iterator
+
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", "dist", "build", "target", ".idea", ".vscode",
+}
+
+def iter_source_files(root: str, extensions: set[str]) -> Iterator[tuple[str, os.stat_result]]:
+    """Yield (path relative to root, stat) for files with one of the given extensions."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.endswith(".egg-info")]
+        for filename in filenames:
+            if os.path.splitext(filename)[1] not in extensions:
+                continue
+            full = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            yield os.path.relpath(full, root), st
+
+def index_path(root: str, kind: str, suffix: str) -> Path:
+    """Location of the persisted index of the given kind for a project root."""
+    digest = hashlib.sha256(os.path.realpath(root).encode()).hexdigest()[:16]
+    return Path.home() / ".openagentcli" / "index" / f"{digest}-{kind}{suffix}"
@@ -0,0 +1,132 @@
+import os
+import time
+import signal
+import itertools
+import threading
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Optional
+
+@dataclass
+class Job:
+    id: int
+    command: str
+    process: subprocess.Popen
+    log_path: Path
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        if self.finished_at is None and self.process.poll() is not None:
+            self.finished_at = time.time()
+        return self.finished_at is None
+
+    def status(self) -> dict:
+        running = self.running
+        end = time.time() if running else self.finished_at
+        return {
+            "job_id": self.id,
+            "command": self.command,
+            "status": "running" if running else "exited",
+            "returncode": None if running else self.process.returncode,
+            "elapsed": round(end - self.started_at, 2),
+            "output_bytes": self.log_path.stat().st_size if self.log_path.exists() else 0,
+        }
+
+class JobTable:
+    """Bounded table of background shell jobs with output spooled to disk."""
+
+    def __init__(self, max_jobs: int = 16, spool_dir: Optional[Path] = None):
+        self.max_jobs = max_jobs
+        self.spool_dir = spool_dir or Path.home() / ".openagentcli" / "jobs" / str(os.getpid())
+        self.jobs: dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        """Drop the oldest finished jobs until there is room for a new one."""
+        finished = sorted((j for j in self.jobs.values() if not j.running), key=lambda j: j.finished_at)
+        while len(self.jobs) >= self.max_jobs and finished:
+            job = finished.pop(0)
+            del self.jobs[job.id]
+            job.log_path.unlink(missing_ok=True)
+        if len(self.jobs) >= self.max_jobs:
+            raise RuntimeError(f"too many running jobs ({self.max_jobs}); wait for one to finish or kill one")
+
+    def start(self, command: str, cwd: Optional[str] = None, env: Optional[dict[str, str]] = None) -> Job:
+        with self._lock:
+            self._evict()
+            job_id = next(self._ids)
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            log_path = self.spool_dir / f"{job_id}.log"
+            with open(log_path, "wb") as log:
+                process = subprocess.Popen(
+                    command,
+                    shell=True,
+                    cwd=cwd,
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=(os.name == "posix"),
+                )
+            job = Job(job_id, command, process, log_path)
+            self.jobs[job_id] = job
+            return job
+
+    def get(self, job_id: int) -> Job:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"no job with id {job_id}")
+        return job
+
+    def output(self, job_id: int, since_offset: int = 0, max_bytes: int = 64 * 1024) -> dict:
+        """Read up to max_bytes of a job's output starting at since_offset."""
+        job = self.get(job_id)
+        running = job.running
+        with open(job.log_path, "rb") as log:
+            log.seek(max(since_offset, 0))
+            data = log.read(max_bytes)
+        next_offset = max(since_offset, 0) + len(data)
+        return {
+            "job_id": job_id,
+            "output": data.decode("utf-8", errors="replace"),
+            "next_offset": next_offset,
+            "more": next_offset < job.log_path.stat().st_size,
+            "status": "running" if running else "exited",
+            "returncode": None if running else job.process.returncode,
+        }
+
+    def kill(self, job_id: int) -> dict:
+        job = self.get(job_id)
+        if job.running:
+            try:
+                if os.name == "posix":
+                    os.killpg(job.process.pid, signal.SIGTERM)
+                else:
+                    job.process.terminate()
+                job.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                if os.name == "posix":
+                    os.killpg(job.process.pid, signal.SIGKILL)
+                else:
+                    job.process.kill()
+                job.process.wait()
+            except ProcessLookupError:
+                pass
+        return job.status()
+
+    def shutdown(self):
+        """Kill all running jobs and remove their spooled output."""
+        for job_id in list(self.jobs):
+            self.kill(job_id)
+            self.jobs[job_id].log_path.unlink(missing_ok=True)
+        self.jobs.clear()
+        try:
+            self.spool_dir.rmdir()
+        except OSError:
+            pass
+
+job_table = JobTable()
@@ -1,8 +1,23 @@
 import os
+import sys
 import subprocess
 from pathlib import Path
 from typing import List, Dict, Any
 from mcp.server.fastmcp import FastMCP
+from .read_cache import read_cache
+from .jobs import job_table
+try:
+    from .shell_sessions import shell_pool, ShellTimeout, ShellUnavailable
+except ImportError:
+    # pty-backed sessions need a POSIX platform; fall back to spawning per call
+    shell_pool = None
+    class ShellTimeout(Exception):
+        pass
+    class ShellUnavailable(Exception):
+        pass
+from .symbol_index import get_index, extract_symbols, SUPPORTED_EXTENSIONS
+from .search_index import get_search_index, notify_changed
+from openagentcli.ui import renderer
 
 mcp = FastMCP("openagentcli")
 
@@ -23,12 +38,20 @@ def validate_path(path: str, must_exist: bool = False) -> str:
     return ""
 
 @mcp.tool()
-def read_file(path: str) -> str:
-    """Read contents of a file."""
+def read_file(path: str, start_line: int = 0, end_line: int = 0) -> str:
+    """Read contents of a file. Optionally pass start_line/end_line (1-based, inclusive) to read only those lines."""
     err = validate_path(path, must_exist=True)
     if err:
         raise ValueError(err)
-    return Path(path).read_text()
+    content = read_cache.get(path)
+    if content is None:
+        content = read_cache.load(path)
+    if not start_line and not end_line:
+        return content
+    lines = content.splitlines(keepends=True)
+    start = max(start_line, 1)
+    end = end_line if end_line > 0 else len(lines)
+    return "".join(lines[start - 1:end])
 
 @mcp.tool()
 def create_file(path: str, content: str) -> str:
@@ -40,6 +63,8 @@ def create_file(path: str, content: str) -> str:
     if p.exists():
         raise FileExistsError(f"{path} already exists")
     p.write_text(content)
+    read_cache.invalidate(path)
+    notify_changed(path)
     return f"Created {path}"
 
 @mcp.tool()
@@ -49,6 +74,8 @@ def overwrite_file(path: str, content: str) -> str:
     if err:
         raise ValueError(err)
     Path(path).write_text(content)
+    read_cache.invalidate(path)
+    notify_changed(path)
     return f"Overwrote {path}"
 
 @mcp.tool()
@@ -62,6 +89,8 @@ def replace_exact_in_file(path: str, old_str: str, new_str: str) -> str:
     if old_str not in content:
         raise ValueError(f"old_str not found in {path}")
     p.write_text(content.replace(old_str, new_str, 1))
+    read_cache.invalidate(path)
+    notify_changed(path)
     return f"Replaced in {path}"
 
 @mcp.tool()
@@ -153,13 +182,103 @@ def search_files_by_content(pattern: str, path: str = ".") -> str:
     return "\n".join(results) if results else f"No files with content matching pattern '{pattern}' found in {path}"
 
 @mcp.tool()
-def shell(command: str) -> Dict[str, Any]:
-    """Execute a bash command and return output."""
+def rank_search(query: str, top_k: int = 10, path: str = ".") -> str:
+    """Ranked keyword search over a project's source and text files (BM25; identifiers are split on camelCase and snake_case). Returns the top_k most relevant files, each with its best-matching lines; use read_file with start_line/end_line to read more."""
+    if not query or not query.strip():
+        raise ValueError("query must be a non-empty string")
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    
+    err = validate_path(path)
+    if err:
+        raise ValueError(err)
+    if not Path(path).is_dir():
+        raise FileNotFoundError(f"directory '{path}' does not exist")
+    
+    hits = get_search_index(path).search(query, top_k)
+    if not hits:
+        return f"No files matching '{query}' found in {path}"
+    
+    results = []
+    for hit in hits:
+        results.append(f"{os.path.join(path, hit['path'])} (score {hit['score']:.2f}) L{hit['start']}-{hit['end']}")
+        for number, line in enumerate(hit['lines'], hit['start']):
+            results.append(f"  {number:>5}: {line[:200]}")
+    return "\n".join(results)
+
+def format_symbol(symbol: dict, location: str = "") -> str:
+    depth = symbol["name"].count(".") if not location else 0
+    return f"{'  ' * depth}{location}L{symbol['start']}-{symbol['end']}  {symbol['signature']}"
+
+@mcp.tool()
+def code_outline(path: str) -> str:
+    """Outline the classes, functions and methods in a source file with signatures and line ranges."""
+    err = validate_path(path, must_exist=True)
+    if err:
+        raise ValueError(err)
+    if Path(path).suffix not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"unsupported file type '{Path(path).suffix}'")
+    
+    full = os.path.realpath(path)
+    if full.startswith(os.path.realpath(".") + os.sep):
+        symbols = get_index(".").outline(full)
+    else:
+        symbols = extract_symbols(full)
+    
+    return "\n".join(format_symbol(s) for s in symbols) if symbols else f"No symbols found in {path}"
+
+@mcp.tool()
+def find_symbol(name: str, path: str = ".") -> str:
+    """Find where a class, function or method is defined. Returns file, line range and signature; use read_file with start_line/end_line to read just that code."""
+    if not name:
+        raise ValueError("name must be a non-empty string")
+    
+    err = validate_path(path)
+    if err:
+        raise ValueError(err)
+    if not Path(path).is_dir():
+        raise FileNotFoundError(f"directory '{path}' does not exist")
+    
+    matches = get_index(path).find(name)
+    if not matches:
+        return f"No symbol matching '{name}' found in {path}"
+    return "\n".join(format_symbol(symbol, f"{os.path.join(path, rel)}:") for rel, symbol in matches)
+
+@mcp.tool()
+def shell(command: str, background: bool = False, timeout: int = 600) -> Dict[str, Any]:
+    """Execute a bash command and return output. Commands run in a persistent bash session, so cd and exported variables carry over between calls (background jobs start in the session's current directory and environment). timeout is in seconds. With background=True, start it as a job and return its job_id immediately; follow it with job_status, job_output and job_kill."""
     if not command or not isinstance(command, str):
         return {"error": "Error: command must be a non-empty string", "returncode": 1}
     
-    import sys
+    if background:
+        cwd, env = None, None
+        if shell_pool is not None:
+            try:
+                cwd, env = shell_pool.state()
+            except ShellUnavailable:
+                pass
+        job = job_table.start(command, cwd, env)
+        return {"job_id": job.id, "status": "running"}
     
+    block = renderer.output_block()
+    try:
+        if shell_pool is None:
+            return run_spawned(command, block)
+        return shell_pool.run(
+            command,
+            timeout,
+            on_stdout=block.feed,
+            on_stderr=lambda text: block.feed(text, sys.stderr)
+        )
+    except ShellUnavailable:
+        return run_spawned(command, block)
+    except ShellTimeout as e:
+        return {"error": str(e), "returncode": -1}
+    finally:
+        block.close()
+
+def run_spawned(command: str, block) -> Dict[str, Any]:
+    """Run command in a fresh /bin/sh; used where pty-backed sessions are unavailable."""
     process = subprocess.Popen(
         command,
         shell=True,
@@ -175,11 +294,11 @@ def shell(command: str) -> Dict[str, Any]:
     stderr_lines = []
     
     for line in process.stdout:
-        print(line, end='', flush=True)
+        block.write(line)
         stdout_lines.append(line)
     
     for line in process.stderr:
-        print(line, end='', file=sys.stderr, flush=True)
+        block.write(line, sys.stderr)
         stderr_lines.append(line)
     
     process.wait()
@@ -190,6 +309,23 @@ def shell(command: str) -> Dict[str, Any]:
         "returncode": process.returncode
     }
 
+@mcp.tool()
+def job_status(job_id: int = 0) -> Any:
+    """Status of a background shell job, or of all jobs when job_id is 0."""
+    if job_id:
+        return job_table.get(job_id).status()
+    return [job.status() for job in job_table.jobs.values()]
+
+@mcp.tool()
+def job_output(job_id: int, since_offset: int = 0) -> Dict[str, Any]:
+    """Output of a background shell job starting at since_offset. Pass the returned next_offset on the next call to get only new output."""
+    return job_table.output(job_id, since_offset)
+
+@mcp.tool()
+def job_kill(job_id: int) -> Dict[str, Any]:
+    """Terminate a background shell job and its child processes."""
+    return job_table.kill(job_id)
+
 def create_server():
     """Create and return the MCP server instance."""
     return mcp
@@ -0,0 +1,118 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class CacheEntry:
+    mtime_ns: int
+    size: int
+    text: str
+    read_seconds: float
+    prefetched: bool
+
+class ReadCache:
+    """Byte-bounded LRU cache of file contents, validated against mtime and size."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_file_bytes: int = 2 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefetch_hits = 0
+        self.prefetched = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+
+    def _drop(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.total_bytes -= entry.size
+
+    def get(self, path: str) -> Optional[str]:
+        """Return cached contents of path if still fresh, counting a hit or miss."""
+        key = os.path.realpath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            st = None
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and st and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                self.seconds_saved += entry.read_seconds
+                if entry.prefetched:
+                    self.prefetch_hits += 1
+                return entry.text
+            if entry:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def load(self, path: str, prefetched: bool = False) -> str:
+        """Read path from disk and store it in the cache."""
+        key = os.path.realpath(path)
+        st = os.stat(key)
+        start = time.perf_counter()
+        with open(key) as f:
+            text = f.read()
+        elapsed = time.perf_counter() - start
+        if st.st_size <= self.max_file_bytes:
+            with self._lock:
+                self._drop(key)
+                self.entries[key] = CacheEntry(st.st_mtime_ns, st.st_size, text, elapsed, prefetched)
+                self.total_bytes += st.st_size
+                if prefetched:
+                    self.prefetched += 1
+                while self.total_bytes > self.max_bytes and self.entries:
+                    self._drop(next(iter(self.entries)))
+        return text
+
+    def warm(self, path: str) -> bool:
+        """Load path into the cache unless a fresh copy is already there."""
+        key = os.path.realpath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return False
+        if st.st_size > self.max_file_bytes:
+            return False
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                return False
+        try:
+            self.load(key, prefetched=True)
+        except (OSError, UnicodeDecodeError):
+            return False
+        return True
+
+    def invalidate(self, path: str):
+        with self._lock:
+            self._drop(os.path.realpath(path))
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "prefetched": self.prefetched,
+                "prefetch_hits": self.prefetch_hits,
+                "seconds_saved": self.seconds_saved,
+            }
+
+read_cache = ReadCache()
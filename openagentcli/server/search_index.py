@@ -0,0 +1,435 @@
+import os
+import re
+import math
+import time
+import secrets
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Optional
+import numpy as np
+from .index_utils import iter_source_files, index_path, SKIP_DIRS
+from .symbol_index import SUPPORTED_EXTENSIONS
+
+INDEX_VERSION = 2
+MAX_FILE_BYTES = 1024 * 1024
+MAX_TERM_LENGTH = 64
+# Changed files are kept in a small pending segment until there are this many
+# (or a quarter of the project, if smaller), or until this fraction of the base matrix belongs to deleted/changed files.
+MAX_PENDING = 512
+MAX_DEAD_FRACTION = 0.25
+# A search only walks the tree again once max(MIN_SCAN_INTERVAL, SCAN_COST_FACTOR * last walk time)
+# has passed; files changed through the edit tools are re-indexed immediately via notify_changed.
+MIN_SCAN_INTERVAL = 1.0
+SCAN_COST_FACTOR = 5
+K1 = 1.2
+B = 0.75
+
+SEARCH_EXTENSIONS = SUPPORTED_EXTENSIONS | {
+    ".md", ".rst", ".txt", ".json", ".yaml", ".yml", ".toml", ".cfg", ".ini", ".sh", ".bash",
+    ".html", ".css", ".scss", ".sql", ".php", ".swift", ".m", ".lua", ".pl", ".r", ".jl",
+    ".ex", ".exs", ".erl", ".hs", ".ml", ".clj", ".dart", ".vue", ".svelte",
+}
+
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[0-9]+")
+_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+@lru_cache(maxsize=1 << 16)
+def split_identifier(word: str) -> tuple[str, ...]:
+    """Lowercased parts of an identifier, plus the whole identifier if it is compound.
+
+    `parseHTTPConfig` -> ("parse", "http", "config", "parsehttpconfig")
+    """
+    parts = [p.lower() for p in _PART.findall(word) if len(p) > 1]
+    whole = word.lower().strip("_")
+    if len(parts) > 1 and len(whole) <= MAX_TERM_LENGTH:
+        parts.append(whole)
+    return tuple(parts)
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for word in _WORD.findall(text):
+        tokens.extend(split_identifier(word))
+    return tokens
+
+class SearchIndex:
+    """Persistent BM25 index over a project's text files.
+
+    Postings are a term-major CSR matrix (indptr/indices/counts) over document
+    ids. Files that change after the matrix was built are tombstoned in it and
+    kept in a small pending segment; the two are merged into a fresh matrix once
+    the pending segment or the tombstones grow too large.
+
+    The matrix is persisted as a base file that is only rewritten on such a
+    merge; terms, documents, tombstones and the pending segment added since go
+    to a small delta file, so saving after a few changed files is cheap.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        self.path = index_path(self.root, "bm25", ".npz")
+        self.delta_path = index_path(self.root, "bm25-delta", ".npz")
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.next_scan = 0.0
+        self._clear()
+        self._load()
+
+    def _clear(self):
+        self.terms: list[str] = []
+        self.vocab: dict[str, int] = {}
+        self.paths: list[str] = []
+        self.mtimes: list[int] = []
+        self.sizes: list[int] = []
+        self.lengths: list[int] = []
+        self.live: list[bool] = []
+        self.by_path: dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.counts = np.zeros(0, dtype=np.uint16)
+        self.pending: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._arrays: Optional[tuple[np.ndarray, np.ndarray]] = None
+        # What the base file holds: the first base_docs documents and len(indptr) - 1 terms
+        self.base_id = secrets.token_hex(8)
+        self.base_docs = 0
+        self.base_dirty = True
+        self.dead_base: set[int] = set()
+
+    def _load(self):
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if int(data["version"]) != INDEX_VERSION or bytes(data["root"]).decode() != self.root:
+                    return
+                self.base_id = bytes(data["base_id"]).decode()
+                self.terms = _strings(data["terms"])
+                self.paths = _strings(data["paths"])
+                self.mtimes = data["mtimes"].tolist()
+                self.sizes = data["sizes"].tolist()
+                self.lengths = data["lengths"].tolist()
+                self.indptr = data["indptr"]
+                self.indices = data["indices"]
+                self.counts = data["counts"]
+        except (OSError, ValueError, KeyError):
+            self._clear()
+            return
+        self.base_docs = len(self.paths)
+        self.base_dirty = False
+        self.live = [True] * self.base_docs
+        self._load_delta()
+        self.vocab = {term: i for i, term in enumerate(self.terms)}
+        self.by_path = {path: i for i, path in enumerate(self.paths) if self.live[i]}
+
+    def _load_delta(self):
+        """Apply the changes saved since the base file was written, if they belong to it."""
+        try:
+            with np.load(self.delta_path, allow_pickle=False) as data:
+                if bytes(data["base_id"]).decode() != self.base_id:
+                    return
+                terms = _strings(data["terms"])
+                paths = _strings(data["paths"])
+                mtimes = data["mtimes"].tolist()
+                sizes = data["sizes"].tolist()
+                lengths = data["lengths"].tolist()
+                live = data["live"].tolist()
+                dead = data["dead"].tolist()
+                pending_ptr = data["pending_indptr"]
+                pending_terms = data["pending_terms"]
+                pending_counts = data["pending_counts"]
+                pending_ids = data["pending_ids"].tolist()
+        except (OSError, ValueError, KeyError):
+            # The base alone is consistent; the next walk re-detects later changes by mtime
+            return
+        self.terms += terms
+        self.paths += paths
+        self.mtimes += mtimes
+        self.sizes += sizes
+        self.lengths += lengths
+        self.live += live
+        self.dead_base = set(dead)
+        for doc_id in dead:
+            self.live[doc_id] = False
+        for i, doc_id in enumerate(pending_ids):
+            span = slice(pending_ptr[i], pending_ptr[i + 1])
+            self.pending[doc_id] = (pending_terms[span], pending_counts[span])
+
+    def save(self):
+        """Write the delta file, and the base file too if it changed since it was last written."""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.base_dirty:
+            base_terms = len(self.indptr) - 1
+            _write_npz(
+                self.path,
+                version=np.array(INDEX_VERSION),
+                root=_bytes(self.root),
+                base_id=_bytes(self.base_id),
+                terms=_bytes("\n".join(self.terms[:base_terms])),
+                paths=_bytes("\n".join(self.paths[:self.base_docs])),
+                mtimes=np.array(self.mtimes[:self.base_docs], dtype=np.int64),
+                sizes=np.array(self.sizes[:self.base_docs], dtype=np.int64),
+                lengths=np.array(self.lengths[:self.base_docs], dtype=np.int64),
+                indptr=self.indptr,
+                indices=self.indices,
+                counts=self.counts,
+            )
+            self.base_dirty = False
+
+        base_terms = len(self.indptr) - 1
+        pending_ids = sorted(self.pending)
+        pending_lengths = [len(self.pending[i][0]) for i in pending_ids]
+        empty = np.zeros(0, dtype=np.int32)
+        _write_npz(
+            self.delta_path,
+            base_id=_bytes(self.base_id),
+            terms=_bytes("\n".join(self.terms[base_terms:])),
+            paths=_bytes("\n".join(self.paths[self.base_docs:])),
+            mtimes=np.array(self.mtimes[self.base_docs:], dtype=np.int64),
+            sizes=np.array(self.sizes[self.base_docs:], dtype=np.int64),
+            lengths=np.array(self.lengths[self.base_docs:], dtype=np.int64),
+            live=np.array(self.live[self.base_docs:], dtype=bool),
+            dead=np.array(sorted(self.dead_base), dtype=np.int64),
+            pending_ids=np.array(pending_ids, dtype=np.int64),
+            pending_indptr=np.concatenate([[0], np.cumsum(pending_lengths, dtype=np.int64)]),
+            pending_terms=np.concatenate([self.pending[i][0] for i in pending_ids]) if pending_ids else empty,
+            pending_counts=np.concatenate([self.pending[i][1] for i in pending_ids]) if pending_ids else empty.astype(np.uint16),
+        )
+        self.dirty = False
+
+    def _term_ids(self, tokens: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        counts = Counter(tokens)
+        ids = np.empty(len(counts), dtype=np.int32)
+        for i, term in enumerate(counts):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                term_id = self.vocab[term] = len(self.terms)
+                self.terms.append(term)
+            ids[i] = term_id
+        values = np.fromiter((min(c, 65535) for c in counts.values()), dtype=np.uint16, count=len(counts))
+        order = np.argsort(ids)
+        return ids[order], values[order]
+
+    def _remove(self, rel: str):
+        doc_id = self.by_path.pop(rel)
+        self.live[doc_id] = False
+        if doc_id < self.base_docs:
+            self.dead_base.add(doc_id)
+        self.pending.pop(doc_id, None)
+        self._arrays = None
+        self.dirty = True
+
+    def _update_file(self, rel: str, st: os.stat_result):
+        doc_id = self.by_path.get(rel)
+        if doc_id is not None and self.mtimes[doc_id] == st.st_mtime_ns and self.sizes[doc_id] == st.st_size:
+            return
+        if doc_id is not None:
+            self._remove(rel)
+        tokens = []
+        if st.st_size <= MAX_FILE_BYTES:
+            try:
+                with open(os.path.join(self.root, rel), encoding="utf-8", errors="replace") as f:
+                    tokens = tokenize(f.read())
+            except OSError:
+                pass
+        doc_id = len(self.paths)
+        self.paths.append(rel)
+        self.mtimes.append(st.st_mtime_ns)
+        self.sizes.append(st.st_size)
+        self.lengths.append(len(tokens))
+        self.live.append(True)
+        self.by_path[rel] = doc_id
+        self.pending[doc_id] = self._term_ids(tokens)
+        self._arrays = None
+        self.dirty = True
+
+    def _compact(self):
+        """Merge the pending segment into a new matrix, dropping dead documents."""
+        live = np.array(self.live, dtype=bool)
+        terms, docs, counts = [], [], []
+        if self.indices.size:
+            base_terms = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int32), np.diff(self.indptr))
+            keep = live[self.indices]
+            terms.append(base_terms[keep])
+            docs.append(self.indices[keep])
+            counts.append(self.counts[keep])
+        for doc_id, (ids, values) in self.pending.items():
+            terms.append(ids)
+            docs.append(np.full(len(ids), doc_id, dtype=np.int32))
+            counts.append(values)
+
+        new_ids = np.cumsum(live, dtype=np.int64) - 1
+        terms = np.concatenate(terms) if terms else np.zeros(0, dtype=np.int32)
+        docs = new_ids[np.concatenate(docs)] if docs else np.zeros(0, dtype=np.int64)
+        counts = np.concatenate(counts) if counts else np.zeros(0, dtype=np.uint16)
+        order = np.argsort(terms, kind="stable")
+        self.indices = docs[order].astype(np.int32)
+        self.counts = counts[order]
+        self.indptr = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(self.terms)), out=self.indptr[1:])
+
+        keep = [i for i, alive in enumerate(self.live) if alive]
+        self.paths = [self.paths[i] for i in keep]
+        self.mtimes = [self.mtimes[i] for i in keep]
+        self.sizes = [self.sizes[i] for i in keep]
+        self.lengths = [self.lengths[i] for i in keep]
+        self.live = [True] * len(keep)
+        self.by_path = {path: i for i, path in enumerate(self.paths)}
+        self.pending = {}
+        self._arrays = None
+        self.base_id = secrets.token_hex(8)
+        self.base_docs = len(self.paths)
+        self.base_dirty = True
+        self.dead_base = set()
+        self.dirty = True
+
+    def _maybe_compact(self):
+        dead = len(self.live) - len(self.by_path)
+        if len(self.pending) > min(MAX_PENDING, len(self.by_path) // 4) or dead > MAX_DEAD_FRACTION * max(len(self.live), 1):
+            self._compact()
+
+    def refresh(self, force: bool = True):
+        """Re-index changed files and drop deleted ones.
+
+        With force=False the walk is skipped if the last one was too recent.
+        """
+        with self.lock:
+            started = time.monotonic()
+            if not force and started < self.next_scan:
+                return
+            seen = set()
+            for rel, st in iter_source_files(self.root, SEARCH_EXTENSIONS):
+                if "\n" in rel:
+                    continue
+                seen.add(rel)
+                self._update_file(rel, st)
+            for rel in set(self.by_path) - seen:
+                self._remove(rel)
+            self._maybe_compact()
+            self.save()
+            now = time.monotonic()
+            self.next_scan = now + max(MIN_SCAN_INTERVAL, SCAN_COST_FACTOR * (now - started))
+
+    def update_path(self, rel: str):
+        """Re-index a single file (or drop it if it is gone) without walking the tree."""
+        parts = rel.split(os.sep)
+        if ("\n" in rel or parts[0] == ".." or os.path.splitext(rel)[1] not in SEARCH_EXTENSIONS
+                or any(p in SKIP_DIRS or p.endswith(".egg-info") for p in parts[:-1])):
+            return
+        with self.lock:
+            try:
+                st = os.stat(os.path.join(self.root, rel))
+            except OSError:
+                if rel in self.by_path:
+                    self._remove(rel)
+            else:
+                self._update_file(rel, st)
+            self._maybe_compact()
+            self.save()
+
+    def _doc_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._arrays is None:
+            self._arrays = (np.array(self.live, dtype=bool), np.array(self.lengths, dtype=np.float32))
+        return self._arrays
+
+    def score(self, query: str) -> tuple[np.ndarray, dict[str, float]]:
+        """BM25 score of every document id, and the idf of each known query term."""
+        live, lengths = self._doc_arrays()
+        scores = np.zeros(len(self.paths), dtype=np.float32)
+        n_docs = len(self.by_path)
+        if not n_docs:
+            return scores, {}
+        norm = K1 * (1 - B + B * lengths / max(lengths[live].mean(), 1.0))
+        base_terms = len(self.indptr) - 1
+        weights = {}
+        for term in dict.fromkeys(tokenize(query)):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            postings = np.zeros(0, dtype=np.int32)
+            tf = np.zeros(0, dtype=np.float32)
+            if term_id < base_terms:
+                span = slice(self.indptr[term_id], self.indptr[term_id + 1])
+                postings = self.indices[span]
+                tf = self.counts[span].astype(np.float32)
+                alive = live[postings]
+                postings, tf = postings[alive], tf[alive]
+            extra_docs, extra_tf = [], []
+            for doc_id, (ids, values) in self.pending.items():
+                i = np.searchsorted(ids, term_id)
+                if i < len(ids) and ids[i] == term_id:
+                    extra_docs.append(doc_id)
+                    extra_tf.append(values[i])
+            if extra_docs:
+                postings = np.concatenate([postings, np.array(extra_docs, dtype=np.int32)])
+                tf = np.concatenate([tf, np.array(extra_tf, dtype=np.float32)])
+            if not postings.size:
+                continue
+            idf = math.log(1 + (n_docs - postings.size + 0.5) / (postings.size + 0.5))
+            weights[term] = idf
+            scores[postings] += idf * tf * (K1 + 1) / (tf + norm[postings])
+        return scores, weights
+
+    def search(self, query: str, top_k: int = 10, window: int = 6) -> list[dict]:
+        """Top documents for a query, each with its best-matching window of lines."""
+        self.refresh(force=False)
+        with self.lock:
+            scores, weights = self.score(query)
+            if not weights:
+                return []
+            k = min(top_k, int(np.count_nonzero(scores)))
+            if not k:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            hits = [(self.paths[i], float(scores[i])) for i in top]
+        return [dict(path=rel, score=score, **best_window(os.path.join(self.root, rel), weights, window))
+                for rel, score in hits]
+
+def _bytes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode(), dtype=np.uint8)
+
+def _strings(data: np.ndarray) -> list[str]:
+    return bytes(data).decode().split("\n") if data.size else []
+
+def _write_npz(path, **arrays):
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+def best_window(path: str, weights: dict[str, float], window: int) -> dict:
+    """The run of `window` lines covering the most query-term weight."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.read(MAX_FILE_BYTES).splitlines()
+    except OSError:
+        return {"start": 0, "end": 0, "lines": []}
+    matched = [set(tokenize(line)) & weights.keys() for line in lines]
+    best, best_score = 0, -1.0
+    for start in range(max(len(lines) - window + 1, 1)):
+        covered = set().union(*matched[start:start + window])
+        # Distinct terms dominate; repeated hits break ties
+        score = sum(weights[t] for t in covered) + 0.01 * sum(len(m) for m in matched[start:start + window])
+        if score > best_score:
+            best, best_score = start, score
+    return {"start": best + 1, "end": min(best + window, len(lines)), "lines": lines[best:best + window]}
+
+_indexes: dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_search_index(root: str) -> SearchIndex:
+    """Shared in-memory SearchIndex for a project root."""
+    key = os.path.realpath(root)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = SearchIndex(key)
+        return _indexes[key]
+
+def notify_changed(path: str):
+    """Re-index a file that was just written in every loaded index that covers it."""
+    full = os.path.realpath(path)
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for index in indexes:
+        if full.startswith(index.root + os.sep):
+            index.update_path(os.path.relpath(full, index.root))
@@ -0,0 +1,285 @@
+import os
+import pty
+import time
+import errno
+import fcntl
+import select
+import signal
+import secrets
+import termios
+import threading
+import subprocess
+from typing import Callable, Optional
+
+class ShellTimeout(Exception):
+    pass
+
+class ShellUnavailable(Exception):
+    """A shell session could not be started (e.g. no /bin/bash)."""
+
+class ShellSession:
+    """A long-lived bash process that runs one command at a time.
+
+    Commands are written to bash's stdin and evaluated with `eval`, so `cd`,
+    exported variables and activated virtualenvs persist between commands. The
+    command's stdout is a pty (programs see a terminal), stderr is a pipe, and
+    each command is followed by a sentinel line carrying its exit code.
+    """
+
+    def __init__(self, shell: str = "/bin/bash", cwd: Optional[str] = None):
+        self.sentinel = f"__OPENAGENTCLI_DONE_{secrets.token_hex(8)}__"
+        master, slave = pty.openpty()
+        attrs = termios.tcgetattr(slave)
+        attrs[1] &= ~termios.OPOST  # no \n -> \r\n translation
+        attrs[3] &= ~termios.ECHO
+        termios.tcsetattr(slave, termios.TCSANOW, attrs)
+
+        env = dict(os.environ, TERM="dumb", PAGER="cat", GIT_PAGER="cat")
+        self.process = subprocess.Popen(
+            [shell, "--noprofile", "--norc"],
+            stdin=subprocess.PIPE,
+            stdout=slave,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+            start_new_session=True,
+        )
+        os.close(slave)
+        self.master = master
+        self.closed = False
+        self.stderr_fd = self.process.stderr.fileno()
+        for fd in (self.master, self.stderr_fd):
+            fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _frame(self, command: str) -> bytes:
+        quoted = "'" + command.replace("'", "'\\''") + "'"
+        return (
+            f"eval {quoted} </dev/null\n"
+            f"printf '\\n%s%d\\n' '{self.sentinel}' \"$?\"\n"
+        ).encode()
+
+    def _read(self, fd: int) -> bytes:
+        try:
+            return os.read(fd, 65536)
+        except BlockingIOError:
+            return b""
+        except OSError as e:
+            # The pty master reports EIO once bash and all its children have exited
+            if e.errno == errno.EIO:
+                return b""
+            raise
+
+    def run(self, command: str, timeout: Optional[float] = None,
+            on_stdout: Optional[Callable[[str], None]] = None,
+            on_stderr: Optional[Callable[[str], None]] = None) -> dict:
+        """Run one command and return its stdout, stderr and exit code.
+
+        on_stdout/on_stderr receive complete lines as they arrive. Raises
+        ShellTimeout (after killing the session) if the command outlives timeout.
+        """
+        try:
+            self.process.stdin.write(self._frame(command))
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            pass
+
+        marker = f"\n{self.sentinel}".encode()
+        deadline = time.monotonic() + timeout if timeout else None
+        stdout = bytearray()
+        stderr = bytearray()
+        emitted = {"out": 0, "err": 0}
+        returncode = None
+
+        def emit(buffer: bytearray, key: str, callback, limit: int):
+            if not callback:
+                return
+            end = buffer.rfind(b"\n", emitted[key], limit)
+            if end >= emitted[key]:
+                callback(buffer[emitted[key]:end + 1].decode("utf-8", errors="replace"))
+                emitted[key] = end + 1
+
+        while returncode is None:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self.kill()
+                raise ShellTimeout(f"command timed out after {timeout}s")
+            ready, _, _ = select.select([self.master, self.stderr_fd], [], [], min(remaining or 0.5, 0.5))
+
+            if self.stderr_fd in ready:
+                stderr += self._read(self.stderr_fd)
+                emit(stderr, "err", on_stderr, len(stderr))
+            if self.master in ready:
+                chunk = self._read(self.master)
+                searched = max(0, len(stdout) - len(marker))
+                stdout += chunk
+                # Only the new tail can contain the marker; rescanning the whole buffer is quadratic
+                index = stdout.find(marker, searched)
+                if index >= 0:
+                    end = stdout.find(b"\n", index + len(marker))
+                    if end >= 0:
+                        returncode = int(stdout[index + len(marker):end])
+                        del stdout[index:]
+                        emit(stdout, "out", on_stdout, len(stdout))
+                        break
+                # Hold back a possible partial marker at the end of the buffer
+                emit(stdout, "out", on_stdout, max(0, len(stdout) - len(marker)))
+                if not chunk and not self.alive:
+                    returncode = self.process.wait()
+            elif not ready and not self.alive:
+                returncode = self.process.wait()
+
+        # stderr written before the sentinel is already in the pipe
+        while True:
+            chunk = self._read(self.stderr_fd)
+            if not chunk:
+                break
+            stderr += chunk
+        if on_stdout and emitted["out"] < len(stdout):
+            on_stdout(stdout[emitted["out"]:].decode("utf-8", errors="replace"))
+        if on_stderr and emitted["err"] < len(stderr):
+            on_stderr(stderr[emitted["err"]:].decode("utf-8", errors="replace"))
+
+        return {
+            "stdout": stdout.decode("utf-8", errors="replace"),
+            "stderr": stderr.decode("utf-8", errors="replace"),
+            "returncode": returncode,
+        }
+
+    def state(self) -> tuple[str, dict[str, str]]:
+        """The session's current directory and exported environment."""
+        fields = self.run("printf '%s\\0' \"$PWD\"; env -0", timeout=10)["stdout"].split("\0")
+        env = dict(field.split("=", 1) for field in fields[1:] if "=" in field)
+        return fields[0], env
+
+    def interrupt(self, grace: float = 0.5):
+        """Forward Ctrl+C to the running command, then kill the session.
+
+        bash runs in its own session, so the terminal's SIGINT never reaches
+        the command; a half-finished command would also leave its sentinel
+        for the next caller, so the session is not reused.
+        """
+        try:
+            os.killpg(self.process.pid, signal.SIGINT)
+        except ProcessLookupError:
+            pass
+        try:
+            # Give the command a moment to handle SIGINT before the group is killed
+            self.process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            pass
+        self.kill()
+
+    def kill(self):
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.alive:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+        try:
+            os.close(self.master)
+        except OSError:
+            pass
+        self.process.stderr.close()
+
+class ShellPool:
+    """Pool of warm shell sessions.
+
+    The most recently used idle session is handed out first, so sequential
+    commands share one session (and its cwd/env); extra sessions are only
+    started when commands run concurrently.
+    """
+
+    def __init__(self, max_sessions: int = 4):
+        self.max_sessions = max_sessions
+        self.idle: list[ShellSession] = []
+        self.busy = 0
+        self.cond = threading.Condition()
+
+    def acquire(self) -> ShellSession:
+        with self.cond:
+            while True:
+                while self.idle:
+                    session = self.idle.pop()
+                    if session.alive:
+                        self.busy += 1
+                        return session
+                    session.close()
+                if self.busy < self.max_sessions:
+                    self.busy += 1
+                    break
+                self.cond.wait()
+        try:
+            return ShellSession()
+        except Exception as e:
+            with self.cond:
+                self.busy -= 1
+                self.cond.notify()
+            raise ShellUnavailable(str(e)) from e
+
+    def release(self, session: ShellSession):
+        with self.cond:
+            self.busy -= 1
+            if session.alive:
+                self.idle.append(session)
+            else:
+                session.close()
+            self.cond.notify()
+
+    def discard(self, session: ShellSession):
+        """Give up a busy session that may still be running a command."""
+        with self.cond:
+            self.busy -= 1
+            self.cond.notify()
+        session.interrupt()
+
+    def run(self, command: str, timeout: Optional[float] = None, **callbacks) -> dict:
+        session = self.acquire()
+        try:
+            result = session.run(command, timeout, **callbacks)
+        except BaseException:
+            # Interrupted or failed mid-command: never hand this session out again
+            self.discard(session)
+            raise
+        self.release(session)
+        return result
+
+    def state(self) -> tuple[Optional[str], Optional[dict[str, str]]]:
+        """cwd and environment of the session the next command would use (None before any command)."""
+        with self.cond:
+            if not self.idle:
+                return None, None
+        session = self.acquire()
+        try:
+            state = session.state()
+        except BaseException:
+            self.discard(session)
+            raise
+        self.release(session)
+        return state
+
+    def close_all(self):
+        with self.cond:
+            idle, self.idle = self.idle, []
+        for session in idle:
+            session.close()
+
+shell_pool = ShellPool()
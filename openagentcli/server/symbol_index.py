@@ -0,0 +1,220 @@
+import os
+import re
+import ast
+import json
+import threading
+from typing import Optional
+from .index_utils import iter_source_files, index_path
+
+INDEX_VERSION = 1
+MAX_FILE_BYTES = 2 * 1024 * 1024
+
+# Lightweight per-language grammars: (kind, pattern with a `name` group).
+# Each pattern is matched against single lines.
+_JS = [
+    ("class", re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+(?P<name>[A-Za-z_$][\w$]*)")),
+    ("function", re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(?P<name>[A-Za-z_$][\w$]*)\s*\(")),
+    ("function", re.compile(r"^\s*(?:export\s+)?(?:const|let|var)\s+(?P<name>[A-Za-z_$][\w$]*)\s*=\s*(?:async\s+)?(?:function\b|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)")),
+    ("interface", re.compile(r"^\s*(?:export\s+)?(?:interface|type|enum)\s+(?P<name>[A-Za-z_$][\w$]*)")),
+    ("method", re.compile(r"^\s+(?:(?:public|private|protected|static|async|readonly|get|set)\s+)*(?P<name>(?!if\b|for\b|while\b|switch\b|catch\b|return\b)[A-Za-z_$][\w$]*)\s*\([^;]*\)\s*(?::\s*[^{]+)?\{\s*$")),
+]
+_GO = [
+    ("function", re.compile(r"^func\s+(?:\([^)]*\)\s*)?(?P<name>\w+)\s*[\[(]")),
+    ("type", re.compile(r"^type\s+(?P<name>\w+)\s+(?:struct|interface)\b")),
+]
+_RUST = [
+    ("function", re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:const\s+)?(?:async\s+)?(?:unsafe\s+)?(?:extern\s+\"[^\"]*\"\s+)?fn\s+(?P<name>\w+)")),
+    ("type", re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:struct|enum|trait|union)\s+(?P<name>\w+)")),
+    ("impl", re.compile(r"^\s*impl(?:<[^>]*>)?\s+(?:[\w:<>, ]+\s+for\s+)?(?P<name>\w+)")),
+]
+_JAVA = [
+    ("class", re.compile(r"^\s*(?:(?:public|private|protected|static|final|abstract|sealed|partial|internal|data|open)\s+)*(?:class|interface|enum|record|struct|object)\s+(?P<name>\w+)")),
+    ("method", re.compile(r"^\s*(?:(?:public|private|protected|static|final|abstract|synchronized|override|virtual|async|internal)\s+)+[\w<>\[\],.? ]+?\s+(?P<name>\w+)\s*\([^;]*$")),
+]
+_C = [
+    ("type", re.compile(r"^\s*(?:typedef\s+)?(?:struct|class|union|enum)\s+(?P<name>\w+)\s*(?::[^;{]*)?\{?\s*$")),
+    ("function", re.compile(r"^(?!\s)(?!.*\b(?:if|for|while|switch|return)\b)[\w:*&<>, ~]+?[\s*&](?P<name>[\w:~]+)\s*\([^;]*$")),
+]
+_RUBY = [
+    ("class", re.compile(r"^\s*(?:class|module)\s+(?P<name>[\w:]+)")),
+    ("method", re.compile(r"^\s*def\s+(?:self\.)?(?P<name>[\w?!=]+)")),
+]
+
+GRAMMARS = {
+    ".js": _JS, ".jsx": _JS, ".mjs": _JS, ".cjs": _JS, ".ts": _JS, ".tsx": _JS,
+    ".go": _GO,
+    ".rs": _RUST,
+    ".java": _JAVA, ".kt": _JAVA, ".cs": _JAVA, ".scala": _JAVA,
+    ".c": _C, ".h": _C, ".cc": _C, ".cpp": _C, ".hpp": _C, ".cxx": _C,
+    ".rb": _RUBY,
+}
+BRACE_LANGUAGES = set(GRAMMARS) - {".rb"}
+SUPPORTED_EXTENSIONS = set(GRAMMARS) | {".py", ".pyi"}
+
+def python_symbols(source: str) -> list[dict]:
+    """Classes, functions and methods of a Python module, via ast."""
+    tree = ast.parse(source)
+    symbols = []
+
+    def visit(body: list, parent: Optional[str], in_class: bool):
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                bases = ", ".join(ast.unparse(b) for b in node.bases)
+                signature = f"class {node.name}({bases})" if bases else f"class {node.name}"
+                kind = "class"
+                is_class = True
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+                returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+                signature = f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+                kind = "method" if in_class else "function"
+                is_class = False
+            else:
+                continue
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            name = f"{parent}.{node.name}" if parent else node.name
+            symbols.append({"name": name, "kind": kind, "signature": signature,
+                            "start": start, "end": node.end_lineno})
+            visit(node.body, name, is_class)
+
+    visit(tree.body, None, False)
+    return symbols
+
+def _brace_end(lines: list[str], start: int) -> int:
+    """Line (1-based) where the brace block opened at or after `start` closes."""
+    depth = 0
+    opened = False
+    for i in range(start, len(lines)):
+        line = re.sub(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|//.*', "", lines[i])
+        for ch in line:
+            if ch == "{":
+                depth += 1
+                opened = True
+            elif ch == "}":
+                depth -= 1
+                if opened and depth <= 0:
+                    return i + 1
+        if not opened and (line.rstrip().endswith(";") or i - start > 3):
+            return start + 1
+    return len(lines)
+
+def regex_symbols(source: str, ext: str) -> list[dict]:
+    """Symbols found by the line-based grammar for a file extension."""
+    lines = source.splitlines()
+    grammar = GRAMMARS[ext]
+    symbols = []
+    for i, line in enumerate(lines):
+        for kind, pattern in grammar:
+            match = pattern.match(line)
+            if match:
+                symbols.append({"name": match.group("name"), "kind": kind,
+                                "signature": line.strip()[:200], "start": i + 1, "end": i + 1})
+                break
+
+    if ext in BRACE_LANGUAGES:
+        for symbol in symbols:
+            symbol["end"] = _brace_end(lines, symbol["start"] - 1)
+    else:
+        for current, following in zip(symbols, symbols[1:] + [None]):
+            current["end"] = following["start"] - 1 if following else len(lines)
+    return symbols
+
+def extract_symbols(path: str) -> list[dict]:
+    ext = os.path.splitext(path)[1]
+    with open(path, encoding="utf-8", errors="replace") as f:
+        source = f.read()
+    if ext in (".py", ".pyi"):
+        try:
+            return python_symbols(source)
+        except SyntaxError:
+            return []
+    if ext in GRAMMARS:
+        return regex_symbols(source, ext)
+    return []
+
+class SymbolIndex:
+    """Persistent per-project symbol index, updated incrementally by mtime and size."""
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        self.path = index_path(self.root, "symbols", ".json")
+        self.files: dict[str, dict] = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION and data.get("root") == self.root:
+            self.files = data["files"]
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "root": self.root, "files": self.files}))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def _update_file(self, rel: str, st: os.stat_result):
+        entry = self.files.get(rel)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return
+        try:
+            symbols = extract_symbols(os.path.join(self.root, rel)) if st.st_size <= MAX_FILE_BYTES else []
+        except OSError:
+            symbols = []
+        self.files[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "symbols": symbols}
+        self.dirty = True
+
+    def refresh(self):
+        """Re-parse changed files and drop deleted ones."""
+        with self.lock:
+            seen = set()
+            for rel, st in iter_source_files(self.root, SUPPORTED_EXTENSIONS):
+                seen.add(rel)
+                self._update_file(rel, st)
+            for rel in set(self.files) - seen:
+                del self.files[rel]
+                self.dirty = True
+            self.save()
+
+    def outline(self, path: str) -> list[dict]:
+        """Symbols of a single file, refreshing only that file."""
+        full = os.path.realpath(path)
+        rel = os.path.relpath(full, self.root)
+        st = os.stat(full)
+        with self.lock:
+            self._update_file(rel, st)
+            self.save()
+            return self.files[rel]["symbols"]
+
+    def find(self, name: str, limit: int = 50) -> list[tuple[str, dict]]:
+        """Definitions matching name exactly (or as a qualified suffix), else by substring."""
+        self.refresh()
+        lowered = name.lower()
+        exact, partial = [], []
+        with self.lock:
+            for rel in sorted(self.files):
+                for symbol in self.files[rel]["symbols"]:
+                    qualified = symbol["name"]
+                    if qualified == name or qualified.endswith("." + name):
+                        exact.append((rel, symbol))
+                    elif lowered in qualified.lower():
+                        partial.append((rel, symbol))
+        return (exact or partial)[:limit]
+
+_indexes: dict[str, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_index(root: str) -> SymbolIndex:
+    """Shared in-memory SymbolIndex for a project root."""
+    key = os.path.realpath(root)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = SymbolIndex(key)
+        return _indexes[key]
@@ -1,15 +1,21 @@
 import time
-from typing import Set, Dict, Callable
+from typing import Set, Dict, Callable, Optional
 from .ui import Colors
 from .tool_display import print_tool_info
 from .diff_utils import generate_diff, colorize_diff
+from .history import EDIT_TOOLS, FileSnapshotTracker
+from .checkpoints import CheckpointStore
+from .profiler import profiler
 from openagentcli.protocol import Message, ProtocolAdapter
 
 class ToolExecutor:
-    def __init__(self, functions_map: Dict[str, Callable], adapter: ProtocolAdapter):
+    def __init__(self, functions_map: Dict[str, Callable], adapter: ProtocolAdapter, snapshots: Optional[FileSnapshotTracker] = None,
+                 checkpoints: Optional[CheckpointStore] = None):
         self.functions_map = functions_map
         self.adapter = adapter
-        self.trusted_tools: Set[str] = {"read_file", "list_directory", "search_files_by_name", "search_files_by_content"}
+        self.snapshots = snapshots
+        self.checkpoints = checkpoints
+        self.trusted_tools: Set[str] = {"read_file", "list_directory", "search_files_by_name", "search_files_by_content", "code_outline", "find_symbol", "rank_search", "job_status", "job_output"}
     
     def confirm_tool(self, tool_name: str) -> bool:
         if tool_name in self.trusted_tools:
@@ -40,7 +46,12 @@ class ToolExecutor:
         print(f"{Colors.TOOL_RESULT}╭─ Result{Colors.RESET}")
         start_time = time.time()
         try:
-            result = self.functions_map[tool_name](**args)
+            if self.checkpoints and tool_name in EDIT_TOOLS and isinstance(args.get("path"), str):
+                self.checkpoints.snapshot(tool_name, [args["path"]])
+            with profiler.section(f"tool {tool_name}"):
+                result = self.functions_map[tool_name](**args)
+            if self.snapshots:
+                result = self.snapshots.record_result(tool_name, args, tool_call_id, result)
             elapsed = time.time() - start_time
             print(f"{Colors.TOOL_RESULT}╰─{Colors.RESET} {Colors.SUCCESS}✓{Colors.RESET} {Colors.DIM}{elapsed:.2f}s{Colors.RESET}\n")
         except Exception as e:
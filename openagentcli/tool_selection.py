@@ -0,0 +1,123 @@
+import json
+import math
+from typing import Optional
+from openagentcli.protocol import Message, ProtocolAdapter, Role, ToolDefinition
+from openagentcli.server.search_index import tokenize
+
+DEFAULT_CORE_TOOLS = ("read_file", "replace_exact_in_file", "create_file", "list_directory", "rank_search", "shell")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from", "how", "in", "is", "it",
+    "me", "my", "of", "on", "or", "please", "the", "this", "that", "to", "use", "we", "what", "with", "you",
+}
+
+# Characters of each recent tool result that are scanned for keywords
+RESULT_SCAN_CHARS = 2000
+
+def minify_schema(schema):
+    """Drop the `title` keys that pydantic adds to every property and the schema itself."""
+    if isinstance(schema, dict):
+        return {k: minify_schema(v) for k, v in schema.items()
+                if not (k == "title" and isinstance(v, str))}
+    if isinstance(schema, list):
+        return [minify_schema(v) for v in schema]
+    return schema
+
+class ToolSelector:
+    """Chooses which tool definitions to send with each request.
+
+    Core tools and every tool already called in the outgoing history are always
+    included; the remaining slots go to the tools whose name and description
+    best match the recent conversation (idf-weighted keyword overlap) plus a
+    bonus for tools used in the last few turns. Schemas are minified once.
+    """
+
+    def __init__(self, tools: list[ToolDefinition], adapter: ProtocolAdapter, core: Optional[list[str]] = None,
+                 max_tools: int = 12, lookback: int = 6, recent_bonus: float = 2.0):
+        self.tools = [ToolDefinition(t.name, t.description.strip(), minify_schema(t.parameters)) for t in tools]
+        self.adapter = adapter
+        names = {t.name for t in tools}
+        self.core = [name for name in (core if core is not None else DEFAULT_CORE_TOOLS) if name in names]
+        self.max_tools = max(max_tools, len(self.core))
+        self.lookback = lookback
+        self.recent_bonus = recent_bonus
+
+        self.keywords: dict[str, dict[str, float]] = {}
+        document_frequency: dict[str, int] = {}
+        for tool in self.tools:
+            counts: dict[str, float] = {}
+            for token in tokenize(tool.name):
+                counts[token] = counts.get(token, 0) + 2.0
+            for token in tokenize(tool.description):
+                if token not in STOPWORDS:
+                    counts[token] = counts.get(token, 0) + 1.0
+            self.keywords[tool.name] = counts
+            for token in counts:
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+        self.idf = {token: math.log(1 + len(self.tools) / df) for token, df in document_frequency.items()}
+
+        self.full_bytes = self.payload_bytes(tools)
+        self.last: Optional[dict] = None
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_full = 0
+
+    def payload_bytes(self, tools: list[ToolDefinition]) -> int:
+        return len(json.dumps(self.adapter.to_provider_tools(tools), separators=(",", ":")))
+
+    def _context(self, messages: list[Message]) -> tuple[set[str], set[str], set[str]]:
+        """Recent keywords, tools called in the recent window, and tools called anywhere."""
+        texts = []
+        recent: set[str] = set()
+        used: set[str] = set()
+        start = max(len(messages) - self.lookback, 0)
+        for i, msg in enumerate(messages):
+            for tc in msg.tool_calls or []:
+                used.add(tc.name)
+                if i >= start:
+                    recent.add(tc.name)
+            if i < start:
+                continue
+            if msg.role == Role.TOOL:
+                texts.append((msg.content or "")[:RESULT_SCAN_CHARS])
+            else:
+                texts.append(msg.content or msg.tool_plan or "")
+        return set(tokenize("\n".join(texts))) - STOPWORDS, recent, used
+
+    def score(self, name: str, tokens: set[str], recent: set[str]) -> float:
+        keywords = self.keywords[name]
+        score = sum(self.idf[t] * keywords[t] for t in tokens if t in keywords)
+        if name in recent:
+            score += self.recent_bonus
+        return score
+
+    def select(self, messages: list[Message]) -> list[ToolDefinition]:
+        tokens, recent, used = self._context(messages)
+        chosen = set(self.core) | used
+        ranked = sorted(
+            ((self.score(t.name, tokens, recent), t.name) for t in self.tools if t.name not in chosen),
+            reverse=True,
+        )
+        for score, name in ranked:
+            if len(chosen) >= self.max_tools or score <= 0:
+                break
+            chosen.add(name)
+
+        # Keep the original order so the tools block stays stable between requests
+        selected = [t for t in self.tools if t.name in chosen]
+        sent = self.payload_bytes(selected)
+        self.requests += 1
+        self.bytes_sent += sent
+        self.bytes_full += self.full_bytes
+        self.last = {"tools": len(selected), "total": len(self.tools), "bytes": sent,
+                     "names": [t.name for t in selected]}
+        return selected
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "full_bytes": self.full_bytes,
+            "bytes_sent": self.bytes_sent,
+            "bytes_full": self.bytes_full,
+            "last": self.last,
+        }
@@ -1,6 +1,12 @@
 import sys
 import time
+import queue
 import threading
+from collections import deque
+from typing import Optional, TextIO
+
+# How often a caller waiting on the render thread checks that it is still alive
+CONTROL_POLL_INTERVAL = 0.5
 
 class Colors:
     USER = "\033[36m"
@@ -18,28 +24,194 @@ class Colors:
     DIFF_HEADER = "\033[1m"
     DIFF_LOCATION = "\033[36m"
 
+class Renderer:
+    """Owns terminal output through a single long-lived render thread.
+
+    Writes are queued and coalesced into at most one write per stream per
+    frame. The spinner animates on the same thread and is stopped through an
+    event, so stopping it never waits for an animation tick.
+    """
+
+    SPINNER_CHARS = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+
+    def __init__(self, fps: int = 30, spinner_interval: float = 0.1):
+        self.frame_interval = 1 / fps
+        self.spinner_interval = spinner_interval
+        self.queue: queue.Queue = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._spinner_label: Optional[str] = None
+        self._spinner_frame = 0
+        self.write_errors = 0
+
+    def _ensure_thread(self):
+        if self.thread is None:
+            with self._start_lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._loop, name="renderer", daemon=True)
+                    self.thread.start()
+
+    def write(self, text: str, stream: Optional[TextIO] = None):
+        """Queue text for the terminal. Defaults to sys.stdout at write time."""
+        self._ensure_thread()
+        self.queue.put(("text", stream, text))
+
+    def _control(self, kind: str, arg=None):
+        self._ensure_thread()
+        done = threading.Event()
+        self.queue.put((kind, arg, done))
+        while not done.wait(CONTROL_POLL_INTERVAL):
+            thread = self.thread
+            if thread is None or not thread.is_alive():
+                self._drain()
+                return
+
+    def _drain(self):
+        """Handle queued items on the calling thread; used if the render thread has died."""
+        with self._start_lock:
+            self.thread = None
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if item[0] == "text":
+                self._guarded(self._write_batch, [(item[1], item[2])])
+            else:
+                self._guarded(self._handle_control, *item)
+
+    def _guarded(self, fn, *args):
+        """Run a terminal write; a failing stream must not kill the render thread."""
+        try:
+            fn(*args)
+        except Exception:
+            self.write_errors += 1
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        self._control("flush")
+
+    def start_spinner(self, label: str = "Thinking..."):
+        self._control("spinner_start", label)
+
+    def stop_spinner(self):
+        """Stop the spinner and clear its line; returns as soon as the line is cleared."""
+        self._control("spinner_stop")
+
+    def _draw_spinner(self):
+        char = self.SPINNER_CHARS[self._spinner_frame % len(self.SPINNER_CHARS)]
+        sys.stdout.write(f'\r{Colors.DIM}{char} {self._spinner_label}{Colors.RESET}')
+        sys.stdout.flush()
+        self._spinner_frame += 1
+
+    def _clear_spinner(self):
+        sys.stdout.write('\r \r')
+
+    def _write_batch(self, batch: list[tuple[Optional[TextIO], str]]):
+        if not batch:
+            return
+        if self._spinner_label is not None:
+            self._clear_spinner()
+        streams = []
+        chunks: dict[int, list[str]] = {}
+        for stream, text in batch:
+            stream = stream or sys.stdout
+            if id(stream) not in chunks:
+                streams.append(stream)
+                chunks[id(stream)] = []
+            chunks[id(stream)].append(text)
+        for stream in streams:
+            stream.write(''.join(chunks[id(stream)]))
+            stream.flush()
+        if self._spinner_label is not None:
+            self._draw_spinner()
+
+    def _handle_control(self, kind: str, arg, done: threading.Event):
+        try:
+            if kind == "spinner_start":
+                self._spinner_label = arg
+                self._spinner_frame = 0
+                self._draw_spinner()
+            elif kind == "spinner_stop":
+                if self._spinner_label is not None:
+                    self._spinner_label = None
+                    self._clear_spinner()
+                    sys.stdout.flush()
+        finally:
+            done.set()
+
+    def _loop(self):
+        last_write = 0.0
+        while True:
+            timeout = self.spinner_interval if self._spinner_label is not None else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._guarded(self._draw_spinner)
+                continue
+
+            batch = []
+            deadline = max(time.monotonic(), last_write + self.frame_interval)
+            while item is not None:
+                if item[0] == "text":
+                    batch.append((item[1], item[2]))
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+                else:
+                    # Control items are handled immediately, after any text queued before them
+                    self._guarded(self._write_batch, batch)
+                    batch = []
+                    self._guarded(self._handle_control, *item)
+                    item = None
+            if batch:
+                self._guarded(self._write_batch, batch)
+                last_write = time.monotonic()
+
+    def output_block(self, head_lines: int = 200, tail_lines: int = 50) -> "OutputBlock":
+        return OutputBlock(self, head_lines, tail_lines)
+
+class OutputBlock:
+    """Streams tool output through the renderer, eliding the middle of very long outputs."""
+
+    def __init__(self, renderer: Renderer, head_lines: int, tail_lines: int):
+        self.renderer = renderer
+        self.head_lines = head_lines
+        self.tail: deque = deque(maxlen=tail_lines)
+        self.lines = 0
+
+    def write(self, line: str, stream: Optional[TextIO] = None):
+        self.lines += 1
+        if self.lines <= self.head_lines:
+            self.renderer.write(line, stream)
+        else:
+            self.tail.append((stream, line))
+
+    def feed(self, text: str, stream: Optional[TextIO] = None):
+        """Write a chunk that may hold several lines."""
+        for line in text.splitlines(keepends=True):
+            self.write(line, stream)
+
+    def close(self):
+        """Emit the elision marker and the retained tail, then wait for it to be written."""
+        elided = self.lines - self.head_lines - len(self.tail)
+        if elided > 0:
+            self.renderer.write(f"{Colors.DIM}... {elided} lines elided ...{Colors.RESET}\n")
+        for stream, line in self.tail:
+            self.renderer.write(line, stream)
+        self.tail.clear()
+        self.renderer.flush()
+
+renderer = Renderer()
+
 class Spinner:
-    def __init__(self):
-        self.spinning = False
-        self.thread = None
-    
+    def __init__(self, label: str = "Thinking..."):
+        self.label = label
+
     def start(self):
-        self.spinning = True
-        self.thread = threading.Thread(target=self._spin)
-        self.thread.start()
-    
+        renderer.start_spinner(self.label)
+
     def stop(self):
-        self.spinning = False
-        if self.thread:
-            self.thread.join()
-        sys.stdout.write('\r \r')
-        sys.stdout.flush()
-    
-    def _spin(self):
-        chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
-        i = 0
-        while self.spinning:
-            sys.stdout.write(f'\r{Colors.DIM}{chars[i % len(chars)]} Thinking...{Colors.RESET}')
-            sys.stdout.flush()
-            time.sleep(0.1)
-            i += 1
+        renderer.stop_spinner()
@@ -16,6 +16,7 @@ setup(
         "cohere",
         "python-dotenv",
         "pyyaml",
+        "numpy",
         readline_pkg,
     ],
     entry_points={
@@ -23,5 +24,5 @@ setup(
             "openagentcli=openagentcli.main:main",
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.10",
 )
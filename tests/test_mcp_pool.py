@@ -0,0 +1,52 @@
+"""MCPServerPool timeouts against local stdio servers."""
+import sys
+import time
+
+import pytest
+
+from openagentcli.mcp_pool import MCPServerPool
+
+SLOW_SERVER = '''
+import asyncio
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("slow")
+
+@server.tool()
+async def wait(seconds: float) -> str:
+    await asyncio.sleep(seconds)
+    return "done"
+
+server.run()
+'''
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+
+def test_startup_timeout_stops_the_server():
+    pool = MCPServerPool([{"name": "hang", "command": "sleep", "args": ["60"]}], connect_timeout=0.5)
+    assert pool.start() == []
+    conn = pool.connections["hang"]
+    assert conn._task.done()
+    assert conn.session is None
+    started = time.monotonic()
+    pool.close()
+    assert time.monotonic() - started < 1
+
+
+def test_slow_tool_call_times_out(tmp_path):
+    script = tmp_path / "slow_server.py"
+    script.write_text(SLOW_SERVER)
+    pool = MCPServerPool([{"name": "slow", "command": sys.executable, "args": [str(script)], "call_timeout": 0.5}])
+    try:
+        assert [t.name for t in pool.start()] == ["slow__wait"]
+        assert pool.call_tool("slow__wait", {"seconds": 0}) == "done"
+        with pytest.raises(TimeoutError):
+            pool.call_tool("slow__wait", {"seconds": 10})
+        # The session survives a timed-out call
+        assert pool.call_tool("slow__wait", {"seconds": 0}) == "done"
+    finally:
+        pool.close()
@@ -0,0 +1,139 @@
+"""OpenAIModel against a local stub of the chat-completions API.
+
+    python -m pytest tests/
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from openagentcli.models.openai_model import OpenAIModel
+from openagentcli.models.scheduler import RateLimitError
+from openagentcli.protocol import Message, Role, ToolDefinition
+
+READ_FILE = ToolDefinition("read_file", "Read a file", {"type": "object", "properties": {"path": {"type": "string"}}})
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_event(self, payload: str):
+        data = f"data: {payload}\n\n".encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.client_address, self.path, body))
+        prompt = body["messages"][-1]["content"]
+
+        if prompt == "rate limit":
+            detail = b'{"error": "slow down"}'
+            self.send_response(429)
+            self.send_header("Retry-After", "3")
+            self.send_header("Content-Length", str(len(detail)))
+            self.end_headers()
+            self.wfile.write(detail)
+            return
+
+        if not body["stream"]:
+            out = json.dumps({
+                "choices": [{"message": {"role": "assistant", "content": f"plain: {prompt}"}}],
+                "usage": {"total_tokens": 42},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        if prompt == "use a tool":
+            # Tool-call arguments split across deltas, as servers stream them
+            self.send_event(json.dumps({"choices": [{"delta": {"content": "Reading it."}}]}))
+            self.send_event(json.dumps({"choices": [{"delta": {"tool_calls": [
+                {"index": 0, "id": "call_1", "type": "function", "function": {"name": "read_file", "arguments": '{"pa'}}]}}]}))
+            self.send_event(json.dumps({"choices": [{"delta": {"tool_calls": [
+                {"index": 0, "function": {"arguments": 'th": "setup.py"}'}}]}}]}))
+        else:
+            for piece in ("Hel", "lo", ", world"):
+                self.send_event(json.dumps({"choices": [{"delta": {"content": piece}}]}))
+        self.send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_model(server, stream: bool = True) -> OpenAIModel:
+    host, port = server.server_address
+    return OpenAIModel(base_url=f"http://{host}:{port}/v1", model="stub", api_key="test", stream=stream)
+
+
+def user(text: str) -> list[Message]:
+    return [Message(role=Role.USER, content=text)]
+
+
+def test_streaming_deltas_are_joined(server):
+    reply = make_model(server).chat(user("hello"), [])
+    assert reply.role == Role.ASSISTANT
+    assert reply.content == "Hello, world"
+    _, path, body = server.requests[0]
+    assert path == "/v1/chat/completions"
+    assert body["stream"] is True
+    assert "tools" not in body
+
+
+def test_streamed_tool_call_is_assembled(server):
+    reply = make_model(server).chat(user("use a tool"), [READ_FILE])
+    assert len(reply.tool_calls) == 1
+    call = reply.tool_calls[0]
+    assert (call.id, call.name, call.arguments) == ("call_1", "read_file", {"path": "setup.py"})
+    assert server.requests[0][2]["tools"][0]["function"]["name"] == "read_file"
+
+
+def test_non_stream_reply(server):
+    reply = make_model(server, stream=False).chat(user("hello"), [])
+    assert reply.content == "plain: hello"
+    assert server.requests[0][2]["stream"] is False
+
+
+def test_chat_stream_yields_raw_chunks(server):
+    chunks = list(make_model(server).chat_stream(user("hello"), []))
+    assert [c["choices"][0]["delta"]["content"] for c in chunks] == ["Hel", "lo", ", world"]
+
+
+def test_connection_is_reused(server):
+    model = make_model(server)
+    for prompt in ("one", "two", "three"):
+        model.chat(user(prompt), [])
+    model.stream = False
+    model.chat(user("four"), [])
+    clients = {address for address, _, _ in server.requests}
+    assert len(server.requests) == 4
+    assert len(clients) == 1
+
+
+def test_rate_limit_raises_with_retry_after(server):
+    model = make_model(server, stream=False)
+    with pytest.raises(RateLimitError) as excinfo:
+        model._post(model._build_body(user("rate limit"), [], stream=False))
+    assert excinfo.value.retry_after == 3.0
+    # The error body was read, so the connection went back to the pool
+    assert model.chat(user("after"), []).content == "plain: after"
+    assert len({address for address, _, _ in server.requests}) == 1
@@ -0,0 +1,68 @@
+"""RouterModel hedging with fake streaming backends."""
+import threading
+import time
+
+import pytest
+
+import openagentcli.config
+from openagentcli.models.base import BaseModel
+from openagentcli.models.router_model import RouterModel
+from openagentcli.protocol import Message, OpenAIAdapter, Role
+
+
+class FakeBackend(BaseModel):
+    """Streams a fixed reply in OpenAI-style chunks, one every `delay` seconds."""
+
+    def __init__(self, reply: str, delay: float):
+        super().__init__(OpenAIAdapter())
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+        self.sent = 0
+        self.closed = threading.Event()
+
+    def chat(self, messages, tools):
+        return self.adapter.from_provider_stream(self.chat_stream(messages, tools))
+
+    def chat_stream(self, messages, tools):
+        self.calls += 1
+        try:
+            for piece in self.reply:
+                time.sleep(self.delay)
+                self.sent += 1
+                yield {"choices": [{"delta": {"content": piece}}]}
+        finally:
+            self.closed.set()
+
+
+@pytest.fixture(autouse=True)
+def fake_build_model(monkeypatch):
+    monkeypatch.setattr(openagentcli.config, "build_model", lambda config, custom_instructions=None: config["fake"])
+
+
+def make_router(primary: FakeBackend, hedge: FakeBackend) -> RouterModel:
+    return RouterModel(
+        backends={"primary": {"fake": primary}, "hedge": {"fake": hedge}},
+        rules={"final": "primary"},
+        hedge={"enabled": True, "initial_delay": 0.05, "backend": "hedge"},
+    )
+
+
+def user(text: str) -> list[Message]:
+    return [Message(role=Role.USER, content=text)]
+
+
+def test_losing_hedge_is_closed_mid_stream():
+    primary = FakeBackend("slow reply", delay=0.1)
+    hedge = FakeBackend("fast", delay=0.005)
+    reply = make_router(primary, hedge).chat(user("hi"), [])
+    assert reply.content == "fast"
+    assert primary.closed.wait(1)
+    assert primary.sent < len("slow reply")
+
+
+def test_fast_primary_is_not_hedged():
+    primary = FakeBackend("ok", delay=0)
+    hedge = FakeBackend("unused", delay=0)
+    assert make_router(primary, hedge).chat(user("hi"), []).content == "ok"
+    assert hedge.calls == 0
@@ -0,0 +1,106 @@
+"""RequestScheduler queueing, retries and interruption."""
+import threading
+import time
+
+import pytest
+
+from openagentcli.models.scheduler import Priority, RateLimitError, RequestScheduler, request_priority
+
+
+def acquire_in_thread(scheduler: RequestScheduler, model: str = "m", priority: Priority = Priority.INTERACTIVE,
+                      order: list = None, name: str = "") -> threading.Thread:
+    def run():
+        with request_priority(priority):
+            with scheduler.slot(model):
+                if order is not None:
+                    order.append(name)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_interrupted_wait_leaves_no_stale_ticket():
+    scheduler = RequestScheduler()
+    scheduler.on_rate_limited(3, 0)
+    real_wait = scheduler.cond.wait
+
+    def interrupted(timeout=None):
+        raise KeyboardInterrupt
+    scheduler.cond.wait = interrupted
+    with pytest.raises(KeyboardInterrupt):
+        with scheduler.slot("m"):
+            pass
+    scheduler.cond.wait = real_wait
+
+    assert scheduler.waiting == []
+    scheduler.blocked_until = 0.0
+    thread = acquire_in_thread(scheduler)
+    thread.join(2)
+    assert not thread.is_alive()
+
+
+def test_interactive_requests_go_before_background():
+    scheduler = RequestScheduler(max_concurrency=1)
+    order = []
+    with scheduler.slot("m"):
+        background = acquire_in_thread(scheduler, priority=Priority.BACKGROUND, order=order, name="background")
+        time.sleep(0.05)
+        interactive = acquire_in_thread(scheduler, order=order, name="interactive")
+        time.sleep(0.05)
+    background.join(2)
+    interactive.join(2)
+    assert order == ["interactive", "background"]
+
+
+def test_per_model_concurrency_cap():
+    scheduler = RequestScheduler(max_concurrency=4, per_model_concurrency={"small": 1})
+    with scheduler.slot("small"):
+        blocked = acquire_in_thread(scheduler, model="small")
+        other = acquire_in_thread(scheduler, model="large")
+        other.join(2)
+        assert not other.is_alive()
+        time.sleep(0.05)
+        assert blocked.is_alive()
+    blocked.join(2)
+    assert not blocked.is_alive()
+
+
+def test_run_retries_rate_limited_requests():
+    scheduler = RequestScheduler(max_retries=3)
+    calls = []
+
+    def request(ticket):
+        calls.append(ticket)
+        if len(calls) < 3:
+            raise RateLimitError("slow down", retry_after=0)
+        return "ok"
+
+    assert scheduler.run("m", 10, request) == "ok"
+    assert len(calls) == 3
+    stats = scheduler.stats()
+    assert stats["rate_limited"] == 2
+    assert stats["completed"] == 1
+    assert stats["rate_scale"] < 1
+
+
+def test_run_gives_up_after_max_retries():
+    scheduler = RequestScheduler(max_retries=1)
+
+    def request(ticket):
+        raise RateLimitError("slow down", retry_after=0)
+
+    with pytest.raises(RateLimitError):
+        scheduler.run("m", 10, request)
+    assert scheduler.total_active == 0
+    assert scheduler.waiting == []
+
+
+def test_released_slot_is_usable_by_others():
+    scheduler = RequestScheduler(max_concurrency=1)
+    with scheduler.slot("m"):
+        with scheduler.released("m"):
+            other = acquire_in_thread(scheduler)
+            other.join(2)
+            assert not other.is_alive()
+        assert scheduler.total_active == 1
+    assert scheduler.total_active == 0
@@ -0,0 +1,116 @@
+"""Incremental parsing of streamed tool calls, and usage reporting of the Cohere stream."""
+from types import SimpleNamespace as NS
+
+from openagentcli.models.cohere_model import CohereModel
+from openagentcli.models.scheduler import Ticket
+from openagentcli.protocol import CohereStreamParser, JsonAccumulator, Message, Role
+
+
+def accumulate(*fragments: str) -> JsonAccumulator:
+    acc = JsonAccumulator()
+    for fragment in fragments:
+        acc.feed(fragment)
+    return acc
+
+
+def content(text):
+    return NS(type="content-delta", delta=NS(message=NS(content=NS(text=text))))
+
+
+def plan(text):
+    return NS(type="tool-plan-delta", delta=NS(message=NS(tool_plan=text)))
+
+
+def call_start(index, id, name, arguments=""):
+    return NS(type="tool-call-start", index=index,
+              delta=NS(message=NS(tool_calls=NS(id=id, function=NS(name=name, arguments=arguments)))))
+
+
+def call_delta(index, arguments):
+    return NS(type="tool-call-delta", index=index,
+              delta=NS(message=NS(tool_calls=NS(function=NS(arguments=arguments)))))
+
+
+def call_end(index):
+    return NS(type="tool-call-end", index=index)
+
+
+def message_end(input_tokens, output_tokens):
+    usage = NS(tokens=NS(input_tokens=input_tokens, output_tokens=output_tokens))
+    return NS(type="message-end", delta=NS(usage=usage))
+
+
+def test_accumulator_completes_on_closing_brace():
+    acc = accumulate('{"path": "a.py", ', '"lines": [1, ', "2]")
+    assert not acc.complete
+    acc.feed("}")
+    assert acc.complete
+    assert acc.value() == {"path": "a.py", "lines": [1, 2]}
+
+
+def test_accumulator_ignores_braces_and_quotes_in_strings():
+    acc = accumulate('{"text": "a } b', ' { \\"quoted\\" ]', '", "n": 1')
+    assert not acc.complete
+    acc.feed("}")
+    assert acc.complete
+    assert acc.value() == {"text": 'a } b { "quoted" ]', "n": 1}
+
+
+def test_accumulator_escape_split_across_fragments():
+    acc = accumulate('{"s": "ends with \\', '"}')
+    assert not acc.complete
+    acc.feed('"}')
+    assert acc.value() == {"s": 'ends with "}'}
+
+
+def test_accumulator_empty_arguments():
+    acc = JsonAccumulator()
+    assert not acc.complete
+    assert acc.value() == {}
+
+
+def test_parser_emits_each_call_when_its_arguments_close():
+    parser = CohereStreamParser()
+    events = [
+        plan("I will read "), plan("both files."),
+        call_start(0, "c1", "read_file", '{"pa'), call_delta(0, 'th": "a.py"'),
+        call_delta(0, "}"),
+        call_start(1, "c2", "read_file"), call_delta(1, '{"path": "{b}.py"}'),
+        call_end(0), call_end(1),
+    ]
+    emitted = [(i, call) for i, event in enumerate(events) if (call := parser.feed(event))]
+
+    assert [(i, c.id, c.arguments) for i, c in emitted] == [
+        (4, "c1", {"path": "a.py"}),
+        (6, "c2", {"path": "{b}.py"}),
+    ]
+    message = parser.message()
+    assert [c.id for c in message.tool_calls] == ["c1", "c2"]
+    assert message.tool_plan == "I will read both files."
+    assert message.content is None
+
+
+def test_parser_finishes_unclosed_call_at_end_event():
+    parser = CohereStreamParser()
+    assert parser.feed(call_start(0, "c1", "list_files")) is None
+    call = parser.feed(call_end(0))
+    assert (call.name, call.arguments) == ("list_files", {})
+
+
+def test_parser_text_reply():
+    parser = CohereStreamParser()
+    for event in (content("Hel"), content("lo"), message_end(10, 2)):
+        assert parser.feed(event) is None
+    assert parser.message().content == "Hello"
+
+
+def test_stream_usage_is_recorded_on_the_ticket(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(Ticket, "record_usage", lambda self, tokens: recorded.append(tokens))
+    monkeypatch.setenv("COHERE_API_KEY", "test")
+    model = CohereModel()
+    model.client = NS(chat_stream=lambda **kwargs: (e for e in [content("Hi"), message_end(120, 8)]))
+
+    events = list(model.stream_events([Message(role=Role.USER, content="hello")], []))
+    assert events[-1].message.content == "Hi"
+    assert recorded == [128]